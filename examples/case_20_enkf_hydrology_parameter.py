@@ -13,6 +13,18 @@ from water_system_simulator.modeling.hydrology.routing_models import MuskingumMo
 from water_system_simulator.control.data_assimilation import EnsembleKalmanFilter
 
 # --- EnKF Wrapper Functions ---
+def _with_curve_number(model_config, cn):
+    """
+    Returns `model_config` with the CN of the first sub-basin replaced.
+    Only the dicts and lists along the path to that value are copied; the
+    rest is shared with `model_config`, which is left unchanged.
+    """
+    sub_basin = dict(model_config['sub_basins'][0])
+    sub_basin['params'] = dict(sub_basin['params'], CN=cn)
+    config = dict(model_config)
+    config['sub_basins'] = [sub_basin] + model_config['sub_basins'][1:]
+    return config
+
 def state_transition_function_factory(model_config, dt, rainfall_ts):
     """
     Factory to create the state transition function for the EnKF.
@@ -23,8 +35,7 @@ def state_transition_function_factory(model_config, dt, rainfall_ts):
         I_prev, O_prev, cn = state_vector
 
         # Create a model instance for this specific step and ensemble member
-        config = copy.deepcopy(model_config)
-        config['sub_basins'][0]['params']['CN'] = cn # Set the CN from the state vector
+        config = _with_curve_number(model_config, cn) # Set the CN from the state vector
 
         runoff_strategy = SCSRunoffModel()
         routing_strategy = MuskingumModel(states={"initial_inflow": I_prev, "initial_outflow": O_prev})
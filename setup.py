@@ -8,7 +8,7 @@ setup(
     install_requires=[
         "pandas",
         "matplotlib",
-        "scipy",
+        "scipy>=1.12",
         "pykrige",
         "numpy",
         "cvxpy",
@@ -8,6 +8,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from water_system_sdk.src.chs_sdk.modules.modeling.storage_models import LinearTank, MuskingumChannelModel, NonlinearTank
 from water_system_sdk.src.chs_sdk.modules.modeling.hydrology.runoff_models import SCSRunoffModel, XinanjiangModel
+from water_system_sdk.src.chs_sdk.modules.modeling.valve_models import BallValve
+from water_system_sdk.src.chs_sdk.modules.modeling.actuator_models import ActuatorBank
 
 class TestCoreModels(unittest.TestCase):
 
@@ -227,3 +229,27 @@ class TestCoreModels(unittest.TestCase):
                                msg="Xinanjiang runoff calculation is incorrect.")
         self.assertAlmostEqual(expected_W, actual_W, places=5,
                                msg="Xinanjiang soil moisture state update is incorrect.")
+
+    def test_actuator_bank_matches_individual_actuators(self):
+        """
+        Tests that stepping an ActuatorBank reproduces ActuatorBase.update
+        on each of its actuators (slew rate, deadband and hysteresis).
+        """
+        valves = [
+            BallValve(cv_max=1.0, initial_opening=0.2, slew_rate=0.05, deadband=0.0, hysteresis=0.0),
+            BallValve(cv_max=1.0, initial_opening=0.8, slew_rate=0.1, deadband=0.05, hysteresis=0.02),
+            BallValve(cv_max=1.0, initial_opening=0.5, deadband=0.1, hysteresis=0.04),
+        ]
+        bank = ActuatorBank.from_actuators(valves)
+
+        targets = [[0.9, 0.1, 0.55], [0.3, 0.12, 0.9], [0.3, 0.7, 0.2]]
+        for k in range(30):
+            step_targets = targets[k // 10]
+            for valve, target in zip(valves, step_targets):
+                valve.set_target(target)
+                valve.update(1.0)
+            bank.set_targets(step_targets)
+            bank.step_all(1.0)
+
+            for i, valve in enumerate(valves):
+                self.assertAlmostEqual(bank.positions[i], valve.get_current_position(), places=12)
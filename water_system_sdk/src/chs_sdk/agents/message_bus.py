@@ -1,3 +1,4 @@
+import threading
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from typing import List, Dict
@@ -47,6 +48,8 @@ class InMemoryMessageBus(BaseMessageBus):
     def __init__(self):
         self._subscriptions: Dict[str, List[BaseAgent]] = defaultdict(list)
         self._message_queue: Dict[str, List[Message]] = defaultdict(list)
+        # Agents may publish from worker threads (see SimulationEngine max_workers).
+        self._publish_lock = threading.Lock()
 
     def subscribe(self, agent: BaseAgent, topic: str):
         """
@@ -60,7 +63,8 @@ class InMemoryMessageBus(BaseMessageBus):
         """
         Adds a message to the internal queue for the specified topic.
         """
-        self._message_queue[message.topic].append(message)
+        with self._publish_lock:
+            self._message_queue[message.topic].append(message)
         log.trace(f"Message published to topic '{message.topic}' by '{message.sender_id}'.")
 
     def dispatch(self):
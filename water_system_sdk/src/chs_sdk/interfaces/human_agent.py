@@ -1,6 +1,7 @@
 from __future__ import annotations
 import logging
-from typing import Any, Dict, List, TYPE_CHECKING
+from collections import deque
+from typing import Any, Deque, Dict, List, TYPE_CHECKING
 
 from ..agent.base_agent import BaseAgent
 
@@ -21,7 +22,7 @@ class HumanAgent(BaseAgent):
     def __init__(self, id: str, message_bus: MessageBus, decision_topics: List[str], **kwargs):
         super().__init__(id=id, message_bus=message_bus, **kwargs)
         self.decision_topics = decision_topics
-        self._pending_requests: List[Dict[str, Any]] = []
+        self._pending_requests: Deque[Dict[str, Any]] = deque()
 
         for topic in self.decision_topics:
             self.message_bus.subscribe(topic, self.handle_decision_request)
@@ -50,7 +51,7 @@ class HumanAgent(BaseAgent):
         self.message_bus.publish(response_topic, decision, sender_id=self.id)
         # A more robust implementation would match the decision to a specific request.
         if self._pending_requests:
-            self._pending_requests.pop(0) # Simple FIFO for this example
+            self._pending_requests.popleft() # Simple FIFO for this example
 
     def step(self, dt: float, **kwargs):
         """
@@ -64,5 +65,5 @@ class HumanAgent(BaseAgent):
             "id": self.id,
             "type": self.__class__.__name__,
             "pending_requests_count": len(self._pending_requests),
-            "pending_requests": self._pending_requests,
+            "pending_requests": list(self._pending_requests),
         }
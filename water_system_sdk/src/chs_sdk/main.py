@@ -4,7 +4,9 @@ import json
 import copy
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from itertools import repeat
 from typing import List, Dict, Any, TYPE_CHECKING
 
 from .agents.agent_status import AgentStatus
@@ -27,16 +29,39 @@ class SimulationMode(Enum):
     HIL = "Hardware-in-the-Loop"  # Connects to real hardware
     HITL = "Human-in-the-Loop"    # Includes human operators
 
+def _numba_kernels_thread_safe() -> bool:
+    """Whether parallel Numba kernels may be launched from several agent threads at once."""
+    try:
+        from .utils.numba_threading import parallel_kernels_thread_safe
+    except ImportError:
+        # Without Numba there are no parallel kernels to collide.
+        return True
+    return parallel_kernels_thread_safe()
+
+
 class SimulationEngine:
     """
     The core of the CHS-SDK, a multi-mode mother machine platform.
     It orchestrates the simulation by managing agents, the message bus,
     and the main time loop.
+
+    In SIL mode, `max_workers` > 1 executes the agents of each step
+    concurrently on a thread pool. This pays off when agents release the
+    GIL (I/O, NumPy or Numba kernels). The order in which agents publish
+    messages within a step is then no longer deterministic. By default
+    agents are executed sequentially, in list order.
+
+    Agents whose models run parallel Numba kernels (e.g. the Xinanjiang
+    runoff or actuator bank kernels) can only be executed concurrently under
+    Numba's 'tbb' or 'omp' threading layer. Under the 'workqueue' layer
+    concurrent kernel launches abort the process, so `max_workers` is then
+    ignored and the agents run sequentially.
     """
-    def __init__(self, mode: SimulationMode, agents: List[BaseAgent], message_bus: MessageBus):
+    def __init__(self, mode: SimulationMode, agents: List[BaseAgent], message_bus: MessageBus, max_workers: int = 1):
         self.mode = mode
         self.agents = agents
         self.message_bus = message_bus
+        self.max_workers = max_workers
         self.is_running = False
         self.current_time_seconds = 0.0
 
@@ -70,34 +95,69 @@ class SimulationEngine:
         self.is_running = True
         stop_time = self.current_time_seconds + duration_seconds
 
-        while self.is_running and self.current_time_seconds < stop_time:
-            logger.debug(f"Simulation step at t = {self.current_time_seconds:.2f}s")
-
-            # 1. Dispatch messages from the previous step to update agent states
-            self.message_bus.dispatch()
-
-            # 2. Execute agents, who will use the new state and publish new messages
-            for agent in self.agents:
-                try:
-                    agent.execute(self.current_time_seconds, time_step_seconds)
-                except Exception as e:
-                    agent_id = getattr(agent, 'agent_id', 'N/A')
-                    logger.error(f"Error in execute() of agent '{agent_id}': {e}", exc_info=True)
-
-            # 3. Dispatch messages published in the current step, so they are processed before the next execute
-            self.message_bus.dispatch()
-
-            # 4. Advance simulation time
-            self.current_time_seconds += time_step_seconds
-
-            # In a real-time simulation (HIL/HITL), we would sleep to match wall-clock time.
-            # For pure SIL, we can run as fast as possible.
-            if self.mode in [SimulationMode.HIL, SimulationMode.HITL]:
-                time.sleep(time_step_seconds)
+        # Loop invariants, looked up once instead of on every step.
+        dispatch = self.message_bus.dispatch
+        agents = list(self.agents)
+        execute_agent = self._execute_agent
+        log_steps = logger.isEnabledFor(logging.DEBUG)
+        # In a real-time simulation (HIL/HITL), we sleep to match wall-clock time.
+        # Sleeping until an absolute deadline keeps the loop from drifting by the
+        # time spent executing each step. For pure SIL, we run as fast as possible.
+        real_time = self.mode in (SimulationMode.HIL, SimulationMode.HITL)
+        next_wakeup = time.monotonic()
+
+        executor = None
+        if self.mode == SimulationMode.SIL and self.max_workers > 1 and len(agents) > 1:
+            if _numba_kernels_thread_safe():
+                executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(agents)))
+            else:
+                logger.warning("Numba's threading layer is not thread-safe; "
+                               "executing agents sequentially despite max_workers > 1.")
+
+        try:
+            while self.is_running and self.current_time_seconds < stop_time:
+                current_time = self.current_time_seconds
+                if log_steps:
+                    logger.debug(f"Simulation step at t = {current_time:.2f}s")
+
+                # 1. Dispatch messages from the previous step to update agent states
+                dispatch()
+
+                # 2. Execute agents, who will use the new state and publish new messages
+                if executor is None:
+                    for agent in agents:
+                        execute_agent(agent, current_time, time_step_seconds)
+                else:
+                    for _ in executor.map(execute_agent, agents, repeat(current_time), repeat(time_step_seconds)):
+                        pass
+
+                # 3. Dispatch messages published in the current step, so they are processed before the next execute
+                dispatch()
+
+                # 4. Advance simulation time
+                self.current_time_seconds = current_time + time_step_seconds
+
+                if real_time:
+                    next_wakeup += time_step_seconds
+                    delay = next_wakeup - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
         logger.info("Simulation run finished.")
         self.is_running = False
 
+    @staticmethod
+    def _execute_agent(agent: BaseAgent, current_time: float, dt: float):
+        """Executes one agent, logging instead of raising if it fails."""
+        try:
+            agent.execute(current_time, dt)
+        except Exception as e:
+            agent_id = getattr(agent, 'agent_id', 'N/A')
+            logger.error(f"Error in execute() of agent '{agent_id}': {e}", exc_info=True)
+
     def stop(self):
         """Stops the simulation loop gracefully."""
         logger.info("Stopping simulation engine.")
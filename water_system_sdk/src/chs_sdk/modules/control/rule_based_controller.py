@@ -1,5 +1,8 @@
 from chs_sdk.modeling.base_model import BaseModel
 
+# Comparison operators a condition may use.
+_OPERATORS = ('>', '<', '==', '>=', '<=', '!=')
+
 class RuleBasedOperationalController(BaseModel):
     def __init__(self, rules: list, default_actions: dict, **kwargs):
         """
@@ -15,6 +18,7 @@ class RuleBasedOperationalController(BaseModel):
         self.rules = rules
         self.default_actions = default_actions
         self.current_actions = default_actions.copy()
+        self._evaluate_rules = self._compile_rules(rules)
 
     def step(self, system_state: dict, dt: float):
         """
@@ -25,73 +29,67 @@ class RuleBasedOperationalController(BaseModel):
             system_state (dict): The current state of the entire system.
             dt (float): The time step for the simulation.
         """
-        self.current_actions = self.default_actions.copy()
-
-        for rule in self.rules:
-            conditions_met = True
-            for condition in rule['if']:
-                try:
-                    comp_id, _, var_path_str = condition['variable'].partition('.')
-                    if comp_id not in system_state:
-                        raise KeyError(f"Component '{comp_id}' not found.")
+        actions = self._evaluate_rules(system_state)
+        self.current_actions = self.default_actions.copy() if actions is None else actions
 
-                    component_obj = system_state[comp_id]
-                    path_keys = var_path_str.split('.')
+    @staticmethod
+    def _compile_rules(rules: list):
+        """
+        Generates and compiles a function that evaluates the rules in order
+        and returns the 'then' actions of the first rule whose conditions are
+        all met, or None.
 
-                    # The user-defined rule format "component.state.variable" implies
-                    # that 'state' is a special keyword to access the component's state dict.
-                    if path_keys[0] == 'state':
-                        if not hasattr(component_obj, 'get_state'):
-                            raise AttributeError(f"Component '{comp_id}' has no get_state method.")
+        Each condition's variable path is resolved into direct lookups once,
+        here, instead of being re-parsed on every step. A variable of the form
+        "component.state.key..." reads the component's get_state() dict; any
+        other "component.attr..." path reads attributes. If the path cannot be
+        resolved (KeyError, AttributeError, TypeError), or the operator is
+        unknown, the condition is not met.
+        """
+        constants = {}
 
-                        # Get the state dictionary, e.g., {'level': 5.0}
-                        current_value = component_obj.get_state()
+        def const(value):
+            name = f"_c{len(constants)}"
+            constants[name] = value
+            return name
 
-                        # Access the variable within the state dictionary
-                        for key in path_keys[1:]: # e.g., ['level']
-                            current_value = current_value[key]
-                        actual_value = current_value
-                    else:
-                        # Fallback for accessing direct attributes if needed in the future,
-                        # though the primary design uses the 'state' keyword.
-                        current_value = component_obj
-                        for key in path_keys:
-                            current_value = getattr(current_value, key)
-                        actual_value = current_value
+        lines = ["def _evaluate_rules(state):"]
+        for rule in rules:
+            # One-pass loop: 'break' skips to the next rule.
+            lines.append("    while True:")
+            for condition in rule['if']:
+                comp_id, _, var_path_str = condition['variable'].partition('.')
+                path_keys = var_path_str.split('.')
 
-                except (KeyError, AttributeError, TypeError) as e:
-                    # If any part of the path fails, the condition is not met.
-                    conditions_met = False
-                    break
+                # The user-defined rule format "component.state.variable" implies
+                # that 'state' is a special keyword to access the component's state dict.
+                expr = f"state[{const(comp_id)}]"
+                if path_keys[0] == 'state':
+                    expr += ".get_state()"
+                    for key in path_keys[1:]:
+                        expr += f"[{const(key)}]"
+                else:
+                    for key in path_keys:
+                        expr = f"getattr({expr}, {const(key)})"
 
+                lines += [
+                    "        try:",
+                    f"            _value = {expr}",
+                    "        except (KeyError, AttributeError, TypeError):",
+                    "            break",
+                ]
                 operator = condition['operator']
-                target_value = condition['value']
-
-                if not self._evaluate_condition(actual_value, operator, target_value):
-                    conditions_met = False
-                    break
-
-            if conditions_met:
-                self.current_actions = rule['then']
-                break
+                if operator in _OPERATORS:
+                    lines.append(f"        if not (_value {operator} {const(condition['value'])}):")
+                    lines.append("            break")
+                else:
+                    lines.append("        break")
+            lines.append(f"        return {const(rule['then'])}")
+        lines.append("    return None")
 
-    def _evaluate_condition(self, actual, op, target):
-        """
-        Evaluates a single condition.
-        """
-        if op == '>':
-            return actual > target
-        if op == '<':
-            return actual < target
-        if op == '==':
-            return actual == target
-        if op == '>=':
-            return actual >= target
-        if op == '<=':
-            return actual <= target
-        if op == '!=':
-            return actual != target
-        return False
+        namespace = dict(constants)
+        exec(compile("\n".join(lines) + "\n", "<rules>", "exec"), namespace)
+        return namespace['_evaluate_rules']
 
     def get_state(self) -> dict:
         """
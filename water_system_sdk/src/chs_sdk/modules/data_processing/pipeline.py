@@ -13,6 +13,8 @@ class DataProcessingPipeline:
             processors (List[BaseDataProcessor]): A list of data processor instances.
         """
         self.processors = processors
+        # Bound process methods, resolved once instead of on every call
+        self._steps = tuple(processor.process for processor in processors)
 
     def process(self, data_input: dict) -> dict:
         """
@@ -25,6 +27,6 @@ class DataProcessingPipeline:
             dict: The processed data dictionary.
         """
         processed_data = data_input
-        for processor in self.processors:
-            processed_data = processor.process(processed_data)
+        for step in self._steps:
+            processed_data = step(processed_data)
         return processed_data
@@ -1,5 +1,175 @@
 import numpy as np
-from typing import List, Tuple, Dict
+from numba import njit, prange
+
+# D8 neighbour offsets and codes, in the order they are searched
+_D8_DR = np.array([0, 1, 1, 1, 0, -1, -1, -1], dtype=np.int64)
+_D8_DC = np.array([1, 1, 0, -1, -1, -1, 0, 1], dtype=np.int64)
+_D8_CODE = np.array([1, 2, 4, 8, 16, 32, 64, 128], dtype=np.uint8)
+_D8_INV_DIST = 1.0 / np.sqrt(_D8_DR ** 2 + _D8_DC ** 2)
+
+# Offset lookup indexed by D8 code (codes that are not a power of two are invalid)
+_D8_VALID = np.zeros(129, dtype=np.bool_)
+_D8_DR_LUT = np.zeros(129, dtype=np.int64)
+_D8_DC_LUT = np.zeros(129, dtype=np.int64)
+_D8_VALID[_D8_CODE] = True
+_D8_DR_LUT[_D8_CODE] = _D8_DR
+_D8_DC_LUT[_D8_CODE] = _D8_DC
+
+
+# Binary min-heap on parallel (key, flat index) arrays. Entries are ordered by
+# key, then by index (like heapq on tuples); sifting moves a hole instead of swapping.
+@njit(cache=True)
+def _heap_push(keys, idxs, n, key, idx):
+    """Pushes (key, idx) onto the heap of size n; returns the new size."""
+    i = n
+    while i > 0:
+        parent = (i - 1) // 2
+        parent_key = keys[parent]
+        if parent_key < key or (parent_key == key and idxs[parent] < idx):
+            break
+        keys[i] = parent_key
+        idxs[i] = idxs[parent]
+        i = parent
+    keys[i] = key
+    idxs[i] = idx
+    return n + 1
+
+
+@njit(cache=True)
+def _heap_pop(keys, idxs, n):
+    """Pops the smallest entry of the heap of size n; returns (key, idx, new size)."""
+    key = keys[0]
+    idx = idxs[0]
+    n -= 1
+    last_key = keys[n]
+    last_idx = idxs[n]
+    i = 0
+    while True:
+        child = 2 * i + 1
+        if child >= n:
+            break
+        child_key = keys[child]
+        child_idx = idxs[child]
+        if child + 1 < n:
+            right_key = keys[child + 1]
+            right_idx = idxs[child + 1]
+            if right_key < child_key or (right_key == child_key and right_idx < child_idx):
+                child += 1
+                child_key = right_key
+                child_idx = right_idx
+        if last_key < child_key or (last_key == child_key and last_idx < child_idx):
+            break
+        keys[i] = child_key
+        idxs[i] = child_idx
+        i = child
+    keys[i] = last_key
+    idxs[i] = last_idx
+    return key, idx, n
+
+
+@njit(cache=True)
+def _fill_sinks_numba(filled_dem, no_data_val):
+    """Priority-flood sink filling from the DEM border, in place."""
+    rows, cols = filled_dem.shape
+    processed = np.zeros((rows, cols), dtype=np.bool_)
+    # Every cell is pushed at most once
+    keys = np.empty(rows * cols, dtype=np.float64)
+    idxs = np.empty(rows * cols, dtype=np.int64)
+    n = 0
+
+    for r in range(rows):
+        for c in range(cols):
+            if r == 0 or r == rows - 1 or c == 0 or c == cols - 1:
+                if filled_dem[r, c] != no_data_val:
+                    n = _heap_push(keys, idxs, n, float(filled_dem[r, c]), r * cols + c)
+                    processed[r, c] = True
+
+    while n > 0:
+        elev, idx, n = _heap_pop(keys, idxs, n)
+        r = idx // cols
+        c = idx % cols
+        for dr in range(-1, 2):
+            for dc in range(-1, 2):
+                if dr == 0 and dc == 0:
+                    continue
+                nr = r + dr
+                nc = c + dc
+                if 0 <= nr < rows and 0 <= nc < cols and not processed[nr, nc]:
+                    if filled_dem[nr, nc] != no_data_val:
+                        processed[nr, nc] = True
+                        new_elev = max(float(filled_dem[nr, nc]), elev)
+                        filled_dem[nr, nc] = new_elev
+                        n = _heap_push(keys, idxs, n, new_elev, nr * cols + nc)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _flow_direction_numba(dem, no_data_val, fdr):
+    """D8 steepest-descent direction of every cell, in parallel over rows."""
+    rows, cols = dem.shape
+    for r in prange(rows):
+        for c in range(cols):
+            if dem[r, c] == no_data_val:
+                fdr[r, c] = 0
+                continue
+
+            # Only a strictly positive slope gives a flow direction
+            max_slope = 0.0
+            direction = 0
+            for k in range(8):
+                nr = r + _D8_DR[k]
+                nc = c + _D8_DC[k]
+                if 0 <= nr < rows and 0 <= nc < cols and dem[nr, nc] != no_data_val:
+                    slope = (float(dem[r, c]) - float(dem[nr, nc])) * _D8_INV_DIST[k]
+                    if slope > max_slope:
+                        max_slope = slope
+                        direction = _D8_CODE[k]
+            fdr[r, c] = direction
+
+
+@njit(cache=True)
+def _downstream_cell(fdr, r, c):
+    """Flat index of the cell that (r, c) drains into, or -1 if none."""
+    rows, cols = fdr.shape
+    direction = fdr[r, c]
+    if direction <= 0 or direction > 128 or not _D8_VALID[direction]:
+        return -1
+    nr = r + _D8_DR_LUT[direction]
+    nc = c + _D8_DC_LUT[direction]
+    if 0 <= nr < rows and 0 <= nc < cols:
+        return nr * cols + nc
+    return -1
+
+
+@njit(cache=True)
+def _flow_accumulation_numba(fdr, fac):
+    """Accumulates upstream cell counts in topological order (Kahn's algorithm)."""
+    rows, cols = fdr.shape
+    in_degree = np.zeros(rows * cols, dtype=np.int8)
+    for r in range(rows):
+        for c in range(cols):
+            down = _downstream_cell(fdr, r, c)
+            if down >= 0:
+                in_degree[down] += 1
+
+    queue = np.empty(rows * cols, dtype=np.int64)
+    tail = 0
+    for i in range(rows * cols):
+        if in_degree[i] == 0:
+            queue[tail] = i
+            tail += 1
+
+    fac_flat = fac.reshape(-1)
+    head = 0
+    while head < tail:
+        i = queue[head]
+        head += 1
+        down = _downstream_cell(fdr, i // cols, i % cols)
+        if down >= 0:
+            fac_flat[down] += fac_flat[i]
+            in_degree[down] -= 1
+            if in_degree[down] == 0:
+                queue[tail] = down
+                tail += 1
 
 class GISTools:
     """
@@ -11,32 +181,8 @@ class GISTools:
         """
         Fills sinks in a Digital Elevation Model (DEM) using a priority queue method.
         """
-        import heapq
-
-        rows, cols = dem.shape
         filled_dem: np.ndarray = np.copy(dem)
-        processed: np.ndarray = np.zeros_like(dem, dtype=bool)
-        pq: List[Tuple[float, int, int]] = []
-
-        for r in range(rows):
-            for c in range(cols):
-                if r == 0 or r == rows - 1 or c == 0 or c == cols - 1:
-                    if dem[r, c] != no_data_val:
-                        heapq.heappush(pq, (float(dem[r, c]), r, c))
-                        processed[r, c] = True
-
-        while pq:
-            elev, r, c = heapq.heappop(pq)
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    if dr == 0 and dc == 0: continue
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < rows and 0 <= nc < cols and not processed[nr, nc]:
-                        if filled_dem[nr, nc] != no_data_val:
-                            processed[nr, nc] = True
-                            new_elev = float(max(filled_dem[nr, nc], elev))
-                            filled_dem[nr, nc] = new_elev
-                            heapq.heappush(pq, (new_elev, nr, nc))
+        _fill_sinks_numba(filled_dem, no_data_val)
         return filled_dem
 
     @staticmethod
@@ -45,41 +191,8 @@ class GISTools:
         Calculates D8 flow direction for each cell in a DEM.
         This version processes the entire grid, including borders.
         """
-        rows, cols = dem.shape
         fdr: np.ndarray = np.zeros_like(dem, dtype=np.uint8)
-
-        neighbors: List[Tuple[int, int, int]] = [
-            (0, 1, 1), (1, 1, 2), (1, 0, 4), (1, -1, 8),
-            (0, -1, 16), (-1, -1, 32), (-1, 0, 64), (-1, 1, 128)
-        ]
-
-        for r in range(rows):  # Process ALL rows
-            for c in range(cols):  # Process ALL columns
-                if dem[r, c] == no_data_val:
-                    fdr[r, c] = 0
-                    continue
-
-                max_slope: float = -np.inf
-                direction: int = 0
-
-                for dr, dc, code in neighbors:
-                    nr, nc = r + dr, c + dc
-
-                    # Bounds check is crucial here
-                    if 0 <= nr < rows and 0 <= nc < cols:
-                        if dem[nr, nc] != no_data_val:
-                            distance: float = float(np.sqrt(dr**2 + dc**2))
-                            slope: float = (float(dem[r, c]) - float(dem[nr, nc])) / distance
-
-                            if slope > max_slope:
-                                max_slope = slope
-                                direction = code
-
-                if max_slope > 0:
-                    fdr[r, c] = direction
-                else:
-                    # It's a sink or flat area, flow direction is 0 (no flow)
-                    fdr[r, c] = 0
+        _flow_direction_numba(dem, no_data_val, fdr)
         return fdr
 
     @staticmethod
@@ -87,37 +200,6 @@ class GISTools:
         """
         Calculates the flow accumulation for each cell using a topological sort.
         """
-        rows, cols = fdr.shape
         fac: np.ndarray = np.ones(fdr.shape, dtype=np.uint32)
-        in_degree: np.ndarray = np.zeros(fdr.shape, dtype=np.uint8)
-
-        d8_to_offset: Dict[int, Tuple[int, int]] = {
-            1: (0, 1), 2: (1, 1), 4: (1, 0), 8: (1, -1),
-            16: (0, -1), 32: (-1, -1), 64: (-1, 0), 128: (-1, 1)
-        }
-
-        for r in range(rows):
-            for c in range(cols):
-                direction = int(fdr[r, c])
-                if direction in d8_to_offset:
-                    dr, dc = d8_to_offset[direction]
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < rows and 0 <= nc < cols:
-                        in_degree[nr, nc] += 1
-
-        queue: List[Tuple[int, int]] = [(r, c) for r in range(rows) for c in range(cols) if in_degree[r, c] == 0]
-        head: int = 0
-        while head < len(queue):
-            r, c = queue[head]
-            head += 1
-
-            direction = int(fdr[r, c])
-            if direction in d8_to_offset:
-                dr, dc = d8_to_offset[direction]
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < rows and 0 <= nc < cols:
-                    fac[nr, nc] += fac[r, c]
-                    in_degree[nr, nc] -= 1
-                    if in_degree[nr, nc] == 0:
-                        queue.append((nr, nc))
+        _flow_accumulation_numba(np.ascontiguousarray(fdr), fac)
         return fac
@@ -1,3 +1,4 @@
+import numpy as np
 from typing import List
 from .node import Node
 from .reach import Reach
@@ -6,21 +7,82 @@ from .structures import BaseStructure
 class HydrodynamicNetwork:
     """
     Container for the entire hydrodynamic network topology, including nodes, reaches, and structures.
+
+    The numeric state of the entities is also available as contiguous arrays
+    (`H`, `Z`, `SA` for nodes, `Q` for reaches, `S` for structures), indexed in
+    the order of the entity lists. Once these arrays are built, the entity
+    attributes (e.g. `node.head`) read from and write to them, so that bulk
+    updates can be done with a single array copy.
     """
     def __init__(self):
         self.nodes: List[Node] = []
         self.reaches: List[Reach] = []
         self.structures: List[BaseStructure] = []
+        self._arrays = None
+
+    def _pack(self):
+        """(Re)builds the state arrays from the entities and binds the entities to them."""
+        node_arrays = {
+            'head': np.array([node.head for node in self.nodes], dtype=float),
+            'bed_elevation': np.array([node.bed_elevation for node in self.nodes], dtype=float),
+            'surface_area': np.array([node.surface_area for node in self.nodes], dtype=float),
+        }
+        reach_arrays = {'discharge': np.array([reach.discharge for reach in self.reaches], dtype=float)}
+        struct_arrays = {'discharge': np.array([s.discharge for s in self.structures], dtype=float)}
+
+        for i, node in enumerate(self.nodes):
+            node._packed = (node_arrays, i)
+        for i, reach in enumerate(self.reaches):
+            reach._packed = (reach_arrays, i)
+        for i, struct in enumerate(self.structures):
+            struct._packed = (struct_arrays, i)
+
+        self._arrays = {
+            'H': node_arrays['head'], 'Z': node_arrays['bed_elevation'], 'SA': node_arrays['surface_area'],
+            'Q': reach_arrays['discharge'], 'S': struct_arrays['discharge'],
+        }
+
+    def _get_array(self, key: str) -> np.ndarray:
+        if self._arrays is None:
+            self._pack()
+        return self._arrays[key]
+
+    @property
+    def H(self) -> np.ndarray:
+        """Water surface elevation of all nodes."""
+        return self._get_array('H')
+
+    @property
+    def Z(self) -> np.ndarray:
+        """Bed elevation of all nodes."""
+        return self._get_array('Z')
+
+    @property
+    def SA(self) -> np.ndarray:
+        """Surface area of all nodes."""
+        return self._get_array('SA')
+
+    @property
+    def Q(self) -> np.ndarray:
+        """Discharge of all reaches."""
+        return self._get_array('Q')
+
+    @property
+    def S(self) -> np.ndarray:
+        """Discharge of all structures."""
+        return self._get_array('S')
 
     def add_node(self, node: Node):
         """Adds a node to the network."""
         if node not in self.nodes:
             self.nodes.append(node)
+            self._arrays = None
 
     def add_reach(self, reach: Reach):
         """Adds a reach to the network and ensures its nodes are also in the network."""
         if reach not in self.reaches:
             self.reaches.append(reach)
+            self._arrays = None
             self.add_node(reach.upstream_node)
             self.add_node(reach.downstream_node)
 
@@ -28,6 +90,7 @@ class HydrodynamicNetwork:
         """Adds a hydraulic structure to the network."""
         if structure not in self.structures:
             self.structures.append(structure)
+            self._arrays = None
             self.add_node(structure.upstream_node)
             self.add_node(structure.downstream_node)
 
@@ -1,9 +1,39 @@
 import uuid
 
+
+class PackedAttribute:
+    """
+    A numeric attribute that is stored on the instance until the entity is
+    packed into a network, after which it reads from and writes to an
+    element of a network-level NumPy array (structure-of-arrays storage).
+    """
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        packed = obj.__dict__.get('_packed')
+        if packed is not None and self.name in packed[0]:
+            return packed[0][self.name][packed[1]]
+        return obj.__dict__[self.name]
+
+    def __set__(self, obj, value):
+        packed = obj.__dict__.get('_packed')
+        if packed is not None and self.name in packed[0]:
+            packed[0][self.name][packed[1]] = value
+        else:
+            obj.__dict__[self.name] = value
+
+
 class Node:
     """
     Base class for a node in the hydrodynamic network.
     """
+    head = PackedAttribute()
+    bed_elevation = PackedAttribute()
+    surface_area = PackedAttribute()
+
     def __init__(self, name: str, **kwargs):
         self.id = uuid.uuid4()
         self.name = name
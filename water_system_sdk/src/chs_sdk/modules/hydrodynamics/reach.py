@@ -1,11 +1,81 @@
 import uuid
 import numpy as np
-from .node import Node
+from numba import njit, vectorize
+from .node import Node, PackedAttribute
+
+
+def trapezoidal_hydraulics(water_depth, bottom_width, side_slope):
+    """
+    Vectorized hydraulic properties of trapezoidal sections, computed in one pass.
+
+    Returns:
+        tuple: (area, wetted_perimeter, hydraulic_radius, top_width), all zero
+        where the water depth is negative.
+    """
+    h = np.maximum(water_depth, 0.0)
+    top_width = np.where(water_depth < 0, 0.0, bottom_width + 2 * side_slope * h)
+    area = (bottom_width + side_slope * h) * h
+    perimeter = np.where(water_depth < 0, 0.0, bottom_width + 2 * h * np.sqrt(1 + side_slope**2))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        radius = np.where(perimeter > 0, area / perimeter, 0.0)
+    return area, perimeter, radius, top_width
+
+
+@njit(cache=True)
+def _critical_depth(discharge, bottom_width, side_slope, g, tolerance, max_iter):
+    """
+    Critical depth of a trapezoidal section by Newton-Raphson on
+    Q^2 / g = A^3 / T, or in closed form for a rectangular section
+    (compiled core of Reach.get_critical_depth).
+    """
+    if abs(discharge) < 1e-6:
+        return 0.0
+
+    # Closed form for a rectangular channel; initial guess otherwise
+    y_crit = (discharge**2 / (bottom_width**2 * g))**(1/3)
+    if side_slope == 0:
+        return y_crit
+
+    for _ in range(max_iter):
+        if y_crit < 0:
+            return y_crit
+        A = (bottom_width + side_slope * y_crit) * y_crit
+        T = bottom_width + 2 * side_slope * y_crit
+
+        if A < 1e-6 or T < 1e-6: # Avoid division by zero
+            return y_crit
+
+        f = A**3 / T - discharge**2 / g
+
+        # Derivative of f(y) w.r.t y
+        dA_dy = T
+        dT_dy = 2 * side_slope
+        df_dy = (3 * A**2 * dA_dy * T - A**3 * dT_dy) / T**2
+
+        if abs(df_dy) < 1e-6:
+            break # Avoid division by zero, solution converged
+
+        y_new = y_crit - f / df_dy
+
+        if abs(y_new - y_crit) < tolerance:
+            return y_new
+        y_crit = y_new
+
+    return y_crit # Return best guess if not converged
+
+
+@vectorize(['float64(float64, float64, float64, float64)'], cache=True)
+def critical_depth(discharge, bottom_width, side_slope, g):
+    """Vectorized critical depth of trapezoidal sections (batched Reach.get_critical_depth)."""
+    return _critical_depth(discharge, bottom_width, side_slope, g, 1e-6, 20)
+
 
 class Reach:
     """
     Represents a river or channel segment (a pipe) in the hydrodynamic network.
     """
+    discharge = PackedAttribute()
+
     def __init__(self, name: str, upstream_node: Node, downstream_node: Node, **kwargs):
         self.id = uuid.uuid4()
         self.name = name
@@ -37,10 +107,19 @@ class Reach:
 
     def get_hydraulic_radius(self, water_depth: float) -> float:
         """Calculates the hydraulic radius for a given water depth."""
-        if water_depth < 0: return 0.0
-        area = self.get_area(water_depth)
-        perimeter = self.get_wetted_perimeter(water_depth)
-        return float(area / perimeter) if perimeter > 0 else 0.0
+        return self.get_hydraulics(water_depth)[2]
+
+    def get_hydraulics(self, water_depth: float) -> tuple:
+        """
+        Calculates area, wetted perimeter, hydraulic radius and top width for a
+        given water depth in a single pass.
+        """
+        if water_depth < 0: return 0.0, 0.0, 0.0, 0.0
+        area = (self.bottom_width + self.side_slope * water_depth) * water_depth
+        perimeter = self.bottom_width + 2 * water_depth * np.sqrt(1 + self.side_slope**2)
+        radius = area / perimeter if perimeter > 0 else 0.0
+        top_width = self.bottom_width + 2 * self.side_slope * water_depth
+        return float(area), float(perimeter), float(radius), float(top_width)
 
     def get_top_width(self, water_depth: float) -> float:
         """Calculates the top width for a given water depth."""
@@ -49,39 +128,12 @@ class Reach:
 
     def get_critical_depth(self, discharge: float, g: float = 9.81, tolerance=1e-6, max_iter=20) -> float:
         """
-        Calculates the critical depth for a given discharge using Newton-Raphson method.
+        Calculates the critical depth for a given discharge using Newton-Raphson method
+        (closed form for rectangular channels).
         Solves the equation: Q^2 / g = A^3 / T
         """
-        if abs(discharge) < 1e-6:
-            return 0.0
-
-        # Initial guess using the formula for a wide rectangular channel
-        y_crit = (discharge**2 / (self.bottom_width**2 * g))**(1/3)
-
-        for _ in range(max_iter):
-            A = self.get_area(y_crit)
-            T = self.get_top_width(y_crit)
-
-            if A < 1e-6 or T < 1e-6: # Avoid division by zero
-                return float(y_crit)
-
-            f = A**3 / T - discharge**2 / g
-
-            # Derivative of f(y) w.r.t y
-            dA_dy = T
-            dT_dy = 2 * self.side_slope
-            df_dy = (3 * A**2 * dA_dy * T - A**3 * dT_dy) / T**2
-
-            if abs(df_dy) < 1e-6:
-                break # Avoid division by zero, solution converged
-
-            y_new = y_crit - f / df_dy
-
-            if abs(y_new - y_crit) < tolerance:
-                return float(y_new)
-            y_crit = y_new
-
-        return float(y_crit) # Return best guess if not converged
+        return float(_critical_depth(float(discharge), float(self.bottom_width), float(self.side_slope),
+                                     float(g), float(tolerance), int(max_iter)))
 
     def get_froude_number(self, water_depth: float, discharge: float, g: float = 9.81) -> float:
         """Calculates the Froude number for a given water depth and discharge."""
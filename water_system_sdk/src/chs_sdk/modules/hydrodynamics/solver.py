@@ -1,9 +1,11 @@
 import numpy as np
-from scipy.sparse import lil_matrix
-from scipy.sparse.linalg import spsolve
+from scipy.sparse import lil_matrix, coo_matrix
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+from scipy.sparse.linalg import splu, bicgstab, LinearOperator
 from .network import HydrodynamicNetwork
 from .node import InflowBoundary, LevelBoundary, JunctionNode
-from .structures import BaseStructure
+from .structures import BaseStructure, WeirStructure
+from .reach import trapezoidal_hydraulics, critical_depth
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -13,7 +15,8 @@ class Solver:
     A hydrodynamic solver for unsteady flow in networks of open channels
     based on the St. Venant equations.
     """
-    def __init__(self, network: HydrodynamicNetwork, tolerance=1e-4, max_iterations=10, relaxation_factor=0.75, h_min=0.01):
+    def __init__(self, network: HydrodynamicNetwork, tolerance=1e-4, max_iterations=10, relaxation_factor=0.75, h_min=0.01,
+                 linear_solver='direct', refactor_interval=5, linear_tolerance=1e-6, anderson_depth=0):
         self.network = network
         self.tolerance = tolerance
         self.max_iterations = max_iterations
@@ -21,6 +24,24 @@ class Solver:
         self.h_min = h_min # Minimum water depth for wet/dry handling
         self.g = 9.81  # gravity
 
+        # Linear solver for the Newton updates:
+        #   'direct'   - sparse LU factorization of every Jacobian.
+        #   'bicgstab' - BiCGSTAB preconditioned with the last LU factorization,
+        #                which is only refreshed every `refactor_interval` solves
+        #                (or when the iterative solve fails).
+        if linear_solver not in ('direct', 'bicgstab'):
+            raise ValueError(f"Unknown linear solver: {linear_solver}")
+        self.linear_solver = linear_solver
+        self.refactor_interval = refactor_interval
+        self.linear_tolerance = linear_tolerance
+        self._lu = None
+        self._solves_since_factorization = 0
+
+        # Anderson acceleration of the damped Newton iteration: mix the last
+        # `anderson_depth` updates (0 disables it). The mixed step is dropped
+        # in favour of the plain damped step whenever the update norm grows.
+        self.anderson_depth = anderson_depth
+
         # Create a unified map for all variables (H, Q, S)
         self.var_map = {}
         node_offset = 0
@@ -39,14 +60,80 @@ class Solver:
         self.num_structures = len(self.network.structures)
         self.num_vars = self.num_nodes + self.num_reaches + self.num_structures
 
+        # Precompute node adjacency once so that assembling the continuity
+        # equations does not rescan every reach/structure for every node.
+        self.in_reach_idx = {node.id: [] for node in self.network.nodes}
+        self.out_reach_idx = {node.id: [] for node in self.network.nodes}
+        self.in_struct_idx = {node.id: [] for node in self.network.nodes}
+        self.out_struct_idx = {node.id: [] for node in self.network.nodes}
+        for reach in self.network.reaches:
+            self.in_reach_idx[reach.downstream_node.id].append(self.var_map[reach.id])
+            self.out_reach_idx[reach.upstream_node.id].append(self.var_map[reach.id])
+        for struct in self.network.structures:
+            self.in_struct_idx[struct.downstream_node.id].append(self.var_map[struct.id])
+            self.out_struct_idx[struct.upstream_node.id].append(self.var_map[struct.id])
+
+        # Reach indices, gathered once so that the momentum equations can be
+        # assembled for all reaches at once with NumPy array operations.
+        reaches = self.network.reaches
+        self.reach_rows = np.array([self.var_map[r.id] for r in reaches], dtype=int)
+        self.reach_up_idx = np.array([self.var_map[r.upstream_node.id] for r in reaches], dtype=int)
+        self.reach_down_idx = np.array([self.var_map[r.downstream_node.id] for r in reaches], dtype=int)
+
+        # WeirStructures, including subclasses, are assembled together with
+        # array operations from their crest_elevation, weir_coefficient and
+        # crest_width (free-flow weir equation), so a subclass must express its
+        # behaviour through those attributes rather than by overriding
+        # add_to_matrix. Any other structure type adds its own equation
+        # through add_to_matrix.
+        structures = self.network.structures
+        weirs = [(i, s) for i, s in enumerate(structures) if isinstance(s, WeirStructure)]
+        self.other_structures = [(i, s) for i, s in enumerate(structures) if not isinstance(s, WeirStructure)]
+        self._weirs = [s for _, s in weirs]
+        self.weir_rows = np.array([self.var_map[s.id] for _, s in weirs], dtype=int)
+        self.weir_struct_idx = np.array([i for i, _ in weirs], dtype=int)
+        self.weir_up_idx = np.array([self.var_map[s.upstream_node.id] for _, s in weirs], dtype=int)
+        self.refresh_static_properties()
+
+        # The sparsity pattern of the Jacobian only depends on the network
+        # topology, so a fill-reducing ordering is computed once here and
+        # reused for every factorization.
+        self._perm, self._inv_perm = self._compute_ordering()
+
+    def refresh_static_properties(self):
+        """
+        Gathers the reach lengths, roughness and cross-section geometry and the
+        weir crest levels and discharge coefficients into the arrays used for
+        assembly. Called at the start of every solve_step, so changes made to
+        the reaches and weirs between steps (calibration, gate or scenario
+        edits) take effect.
+        """
+        reaches = self.network.reaches
+        self.reach_length = np.array([r.length for r in reaches], dtype=float)
+        self.reach_manning = np.array([r.manning_coefficient for r in reaches], dtype=float)
+        self.reach_bottom_width = np.array([r.bottom_width for r in reaches], dtype=float)
+        self.reach_side_slope = np.array([r.side_slope for r in reaches], dtype=float)
+        self.weir_crest = np.array([s.crest_elevation for s in self._weirs], dtype=float)
+        self.weir_cw = np.array([s.weir_coefficient * s.crest_width for s in self._weirs], dtype=float)
+
     def solve_step(self, dt: float):
-        H_old = np.array([node.head for node in self.network.nodes], dtype=float)
-        Q_old = np.array([reach.discharge for reach in self.network.reaches], dtype=float)
-        S_old = np.array([struct.discharge for struct in self.network.structures], dtype=float)
+        self.refresh_static_properties()
+
+        # Bulk copies of the network's packed state arrays.
+        H_old = self.network.H.copy()
+        Q_old = self.network.Q.copy()
+        S_old = self.network.S.copy()
+
+        # H_new, Q_new and S_new are views into the full iterate x.
+        x = np.concatenate((H_old, Q_old, S_old))
+        H_new = x[0:self.num_nodes]
+        Q_new = x[self.num_nodes : self.num_nodes + self.num_reaches]
+        S_new = x[self.num_nodes + self.num_reaches :]
 
-        H_new = np.copy(H_old)
-        Q_new = np.copy(Q_old)
-        S_new = np.copy(S_old)
+        # Anderson history: differences of successive damped updates (f) and
+        # of successive fixed-point images x + f (g).
+        f_prev = g_prev = None
+        df_hist, dg_hist = [], []
 
         for k in range(self.max_iterations):
             A = lil_matrix((self.num_vars, self.num_vars))
@@ -59,17 +146,33 @@ class Solver:
                 if A_csr.nnz == 0:
                     logging.warning("Matrix A is empty. Check network configuration.")
                     return False
-                dx = spsolve(A_csr, -B)
+                dx = self._solve_linear(A_csr, -B)
             except Exception as e:
                 logging.error(f"Could not solve the system: {e}")
                 self._revert_to_old_state(H_old, Q_old, S_old)
                 return False
 
-            H_new += self.relaxation_factor * dx[0:self.num_nodes]
-            Q_new += self.relaxation_factor * dx[self.num_nodes : self.num_nodes + self.num_reaches]
-            S_new += self.relaxation_factor * dx[self.num_nodes + self.num_reaches :]
-
             norm = np.linalg.norm(dx)
+            f = self.relaxation_factor * dx
+            if self.anderson_depth > 0:
+                g = x + f
+                if f_prev is not None and np.linalg.norm(f) < np.linalg.norm(f_prev):
+                    df_hist.append(f - f_prev)
+                    dg_hist.append(g - g_prev)
+                    if len(df_hist) > self.anderson_depth:
+                        df_hist.pop(0)
+                        dg_hist.pop(0)
+                    gamma = np.linalg.lstsq(np.column_stack(df_hist), f, rcond=None)[0]
+                    x[:] = g - np.column_stack(dg_hist) @ gamma
+                else:
+                    # First iterate or diverging update: plain damped step.
+                    df_hist.clear()
+                    dg_hist.clear()
+                    x[:] = g
+                f_prev, g_prev = f, g
+            else:
+                x += f
+
             if norm < self.tolerance:
                 self._update_network_state(H_new, Q_new, S_new)
                 return True
@@ -78,18 +181,54 @@ class Solver:
         self._revert_to_old_state(H_old, Q_old, S_old)
         return False
 
+    def _compute_ordering(self):
+        """
+        Computes a reverse Cuthill-McKee ordering of the variables from the
+        structural sparsity pattern of the Jacobian (all entries that can ever
+        be non-zero).
+        """
+        rows, cols = list(range(self.num_vars)), list(range(self.num_vars))
+        for reach in self.network.reaches:
+            for node in (reach.upstream_node, reach.downstream_node):
+                rows += [self.var_map[reach.id], self.var_map[node.id]]
+                cols += [self.var_map[node.id], self.var_map[reach.id]]
+        for struct in self.network.structures:
+            for node in (struct.upstream_node, struct.downstream_node):
+                rows += [self.var_map[struct.id], self.var_map[node.id]]
+                cols += [self.var_map[node.id], self.var_map[struct.id]]
+        pattern = coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(self.num_vars, self.num_vars)).tocsr()
+        perm = reverse_cuthill_mckee(pattern, symmetric_mode=True).astype(int)
+        return perm, np.argsort(perm)
+
+    def _solve_linear(self, A_csr, rhs):
+        """Solves A x = rhs in the precomputed variable ordering."""
+        perm, inv_perm = self._perm, self._inv_perm
+        A_perm = A_csr[perm][:, perm]
+        rhs_perm = rhs[perm]
+
+        if (self.linear_solver == 'bicgstab' and self._lu is not None
+                and self._solves_since_factorization < self.refactor_interval):
+            M = LinearOperator(A_perm.shape, matvec=self._lu.solve)
+            x, info = bicgstab(A_perm, rhs_perm, M=M, rtol=self.linear_tolerance)
+            if info == 0:
+                self._solves_since_factorization += 1
+                return x[inv_perm]
+
+        self._lu = splu(A_perm.tocsc(), permc_spec='NATURAL')
+        self._solves_since_factorization = 0
+        return self._lu.solve(rhs_perm)[inv_perm]
+
     def _revert_to_old_state(self, H, Q, S):
-        for i, node in enumerate(self.network.nodes): node.head = H[i]
-        for i, reach in enumerate(self.network.reaches): reach.discharge = Q[i]
-        for i, struct in enumerate(self.network.structures): struct.discharge = S[i]
+        self._update_network_state(H, Q, S)
 
     def _update_network_state(self, H, Q, S):
-        for i, node in enumerate(self.network.nodes): node.head = H[i]
-        for i, reach in enumerate(self.network.reaches): reach.discharge = Q[i]
-        for i, struct in enumerate(self.network.structures): struct.discharge = S[i]
+        np.copyto(self.network.H, H)
+        np.copyto(self.network.Q, Q)
+        np.copyto(self.network.S, S)
 
     def _build_matrix(self, A, B, H_k, Q_k, S_k, H_n, Q_n, S_n, dt):
         # Row index corresponds to the equation for that variable
+        Z, SA = self.network.Z, self.network.SA
 
         # 1. Node Continuity Equations (num_nodes equations)
         for i, node in enumerate(self.network.nodes):
@@ -97,17 +236,17 @@ class Solver:
             row_idx = node_idx
 
             # --- Wet/Dry Handling ---
-            water_depth = H_k[node_idx] - node.bed_elevation
+            water_depth = H_k[node_idx] - Z[node_idx]
             if water_depth < self.h_min and not isinstance(node, LevelBoundary):
                 # Treat as a dry node. Equation becomes H = bed_elevation.
                 A[row_idx, node_idx] = 1.0
-                B[row_idx] = H_k[node_idx] - node.bed_elevation
+                B[row_idx] = H_k[node_idx] - Z[node_idx]
                 # Also, set any flows connected to this node to zero.
                 # This is handled implicitly by the reach momentum equation's own wet/dry check.
                 continue
 
             # --- Node Storage Term (d(Vol)/dt) ---
-            storage_term_coeff = node.surface_area / dt
+            storage_term_coeff = SA[node_idx] / dt
             A[row_idx, node_idx] = storage_term_coeff
             B[row_idx] = storage_term_coeff * (H_k[node_idx] - H_n[node_idx])
 
@@ -116,30 +255,22 @@ class Solver:
             outflow_sum = 0
 
             # Reaches flowing in
-            for r in self.network.reaches:
-                if r.downstream_node.id == node.id:
-                    reach_idx_var = self.var_map[r.id]
-                    inflow_sum += Q_k[reach_idx_var - self.num_nodes]
-                    A[row_idx, reach_idx_var] = -1.0 # dF/dQ_in = -1
+            for reach_idx_var in self.in_reach_idx[node.id]:
+                inflow_sum += Q_k[reach_idx_var - self.num_nodes]
+                A[row_idx, reach_idx_var] = -1.0 # dF/dQ_in = -1
             # Structures flowing in
-            for s in self.network.structures:
-                if s.downstream_node.id == node.id:
-                    struct_idx_var = self.var_map[s.id]
-                    inflow_sum += S_k[struct_idx_var - self.num_nodes - self.num_reaches]
-                    A[row_idx, struct_idx_var] = -1.0 # dF/dQ_in = -1
+            for struct_idx_var in self.in_struct_idx[node.id]:
+                inflow_sum += S_k[struct_idx_var - self.num_nodes - self.num_reaches]
+                A[row_idx, struct_idx_var] = -1.0 # dF/dQ_in = -1
 
             # Reaches flowing out
-            for r in self.network.reaches:
-                if r.upstream_node.id == node.id:
-                    reach_idx_var = self.var_map[r.id]
-                    outflow_sum += Q_k[reach_idx_var - self.num_nodes]
-                    A[row_idx, reach_idx_var] = 1.0 # dF/dQ_out = +1
+            for reach_idx_var in self.out_reach_idx[node.id]:
+                outflow_sum += Q_k[reach_idx_var - self.num_nodes]
+                A[row_idx, reach_idx_var] = 1.0 # dF/dQ_out = +1
             # Structures flowing out
-            for s in self.network.structures:
-                if s.upstream_node.id == node.id:
-                    struct_idx_var = self.var_map[s.id]
-                    outflow_sum += S_k[struct_idx_var - self.num_nodes - self.num_reaches]
-                    A[row_idx, struct_idx_var] = 1.0 # dF/dQ_out = +1
+            for struct_idx_var in self.out_struct_idx[node.id]:
+                outflow_sum += S_k[struct_idx_var - self.num_nodes - self.num_reaches]
+                A[row_idx, struct_idx_var] = 1.0 # dF/dQ_out = +1
 
             # Add flow contributions to the B vector. F = ... - (Q_in - Q_out)
             B[row_idx] -= (inflow_sum - outflow_sum)
@@ -158,82 +289,117 @@ class Solver:
                 A[row_idx, node_idx] = 1.0
                 B[row_idx] = H_k[node_idx] - node.level
 
-        # 2. Reach Momentum Equations (num_reaches equations)
-        for i, reach in enumerate(self.network.reaches):
-            reach_idx_var = self.var_map[reach.id]
-            row_idx = reach_idx_var
+        # 2. Reach Momentum Equations (num_reaches equations), vectorized over all reaches
+        if self.num_reaches > 0:
+            self._build_reach_momentum(A, B, H_k, Q_k, Q_n, dt)
+
+        # 3. Structure Equations (num_structures equations)
+        if len(self.weir_rows) > 0:
+            self._build_weir_equations(A, B, H_k, S_k)
 
-            up_node_idx = self.var_map[reach.upstream_node.id]
-            down_node_idx = self.var_map[reach.downstream_node.id]
-            reach_idx_Q = reach_idx_var - self.num_nodes
+        for i, struct in self.other_structures:
+            up_node_idx = self.var_map[struct.upstream_node.id]
 
-            H_up_k, H_down_k, Q_r_k = H_k[up_node_idx], H_k[down_node_idx], Q_k[reach_idx_Q]
-            Q_r_n = Q_n[reach_idx_Q]
+            H_up = H_k[up_node_idx]
+            Q_s = S_k[i] # 'i' is the index in the structures list and S_k array
 
-            h_up = H_up_k - reach.upstream_node.bed_elevation
-            h_down_k = H_down_k - reach.downstream_node.bed_elevation
+            # The structure itself adds its equation to the matrix
+            struct.add_to_matrix(A, B, self.var_map, H_up, Q_s)
 
+    def _build_weir_equations(self, A, B, H_k, S_k):
+        """
+        Assembles the free-flow weir equations of all WeirStructures at once:
+        F(Q_s, H_up) = Q_s - Cw * b * (H_up - Z_crest)^(3/2) = 0, or Q_s = 0
+        when the water level is below the crest.
+        """
+        rows = self.weir_rows
+        head_on_crest = H_k[self.weir_up_idx] - self.weir_crest
+        flowing = head_on_crest > 0
+        head = np.where(flowing, head_on_crest, 0.0)
+        sqrt_head = np.sqrt(head)
+
+        B[rows] = S_k[self.weir_struct_idx] - self.weir_cw * head * sqrt_head
+        A[rows, rows] = 1.0 # dF/dQs = 1
+        A[rows[flowing], self.weir_up_idx[flowing]] = -1.5 * self.weir_cw[flowing] * sqrt_head[flowing] # dF/dH_up
+
+    def _build_reach_momentum(self, A, B, H_k, Q_k, Q_n, dt):
+        """
+        Assembles the momentum equations of all reaches with NumPy array operations.
+        Supercritical and dry reaches are handled with boolean masks.
+        """
+        g = self.g
+        rows, up, down = self.reach_rows, self.reach_up_idx, self.reach_down_idx
+        L, n = self.reach_length, self.reach_manning
+        b, m = self.reach_bottom_width, self.reach_side_slope
+
+        H_up_k = H_k[up]
+        Q_r_k = Q_k
+        z_up = self.network.Z[up]
+        z_down = self.network.Z[down]
+        h_up = H_up_k - z_up
+        h_down_k = H_k[down] - z_down
+
+        with np.errstate(divide='ignore', invalid='ignore'):
             # --- Supercritical Flow Handling ---
-            froude_up = reach.get_froude_number(h_up, Q_r_k, self.g)
+            A_up, P_up, Rh_up, B_up = trapezoidal_hydraulics(h_up, b, m)
+            froude_up = np.where((h_up > 1e-6) & (A_up > 1e-6),
+                                 (Q_r_k / A_up) / np.sqrt(g * A_up / B_up), 0.0)
             is_supercritical = froude_up > 1.0
 
-            h_down_eff = h_down_k # Effective h_down to be used in calculations
+            # If downstream is subcritical, it shouldn't influence upstream.
+            # Cap the downstream depth at critical depth to enforce this.
+            yc = np.zeros(self.num_reaches)
+            sc = np.flatnonzero(is_supercritical)
+            if sc.size:
+                yc[sc] = critical_depth(Q_r_k[sc], b[sc], m[sc], g)
+            is_capped = is_supercritical & (h_down_k > yc)
+            h_down_eff = np.where(is_capped, yc, h_down_k)
 
-            if is_supercritical:
-                yc = reach.get_critical_depth(Q_r_k, self.g)
-                # If downstream is subcritical, it shouldn't influence upstream.
-                # Cap the downstream depth at critical depth to enforce this.
-                if h_down_k > yc:
-                    h_down_eff = yc
+            is_dry = (h_up <= 1e-3) | (h_down_eff <= 1e-3)
+            wet = ~is_dry
 
-            if h_up <= 1e-3 or h_down_eff <= 1e-3:
-                A[row_idx, reach_idx_var] = 1.0
-                B[row_idx] = Q_r_k
-                continue
-
-            A_up = reach.get_area(h_up); A_down = reach.get_area(h_down_eff)
-            P_up = reach.get_wetted_perimeter(h_up); P_down = reach.get_wetted_perimeter(h_down_eff)
-            Rh_up = A_up / P_up if P_up > 0 else 0; Rh_down = A_down / P_down if P_down > 0 else 0
+            A_down, P_down, Rh_down, B_down = trapezoidal_hydraulics(h_down_eff, b, m)
             A_avg = (A_up + A_down) / 2.0; Rh_avg = (Rh_up + Rh_down) / 2.0
-            B_up = reach.get_top_width(h_up); B_down = reach.get_top_width(h_down_eff)
-            L = reach.length; n = reach.manning_coefficient
 
             # Effective downstream water level for pressure term
-            H_down_eff = h_down_eff + reach.downstream_node.bed_elevation
+            H_down_eff = h_down_eff + z_down
+            dH = H_down_eff - H_up_k
 
-            time_term = (Q_r_k - Q_r_n) / dt
-            pressure_term = (self.g * A_avg / L) * (H_down_eff - H_up_k)
-            conv_term = 0 if L == 0 else ((Q_r_k**2 / A_down if A_down > 0 else 0) - (Q_r_k**2 / A_up if A_up > 0 else 0)) / L
+            inv_A_up = np.where(A_up > 0, 1.0 / A_up, 0.0)
+            inv_A_down = np.where(A_down > 0, 1.0 / A_down, 0.0)
+            inv_L = np.where(L == 0, 0.0, 1.0 / L)
+            Q_sq = Q_r_k**2
+
+            time_term = (Q_r_k - Q_n) / dt
+            pressure_term = (g * A_avg / L) * dH
+            conv_term = (Q_sq * inv_A_down - Q_sq * inv_A_up) * inv_L
 
             # Semi-implicit friction term for stability
-            S_f = (n**2 * Q_r_k * abs(Q_r_n)) / (A_avg**2 * Rh_avg**(4./3.)) if A_avg > 0 and Rh_avg > 0 else 0
-            friction_term = self.g * A_avg * S_f
-            B[row_idx] = time_term + conv_term + pressure_term + friction_term
+            has_friction = (A_avg > 0) & (Rh_avg > 0)
+            # Rh^(4/3) as Rh * cbrt(Rh) avoids a fractional power
+            friction_denom = np.where(has_friction, A_avg**2 * (Rh_avg * np.cbrt(Rh_avg)), 1.0)
+            S_f = np.where(has_friction, (n**2 * Q_r_k * np.abs(Q_n)) / friction_denom, 0.0)
+            friction_term = g * A_avg * S_f
 
             # --- Jacobian Derivatives ---
             # Derivative of the semi-implicit friction term
-            dFric_dQr = (self.g * A_avg * (n**2 * abs(Q_r_n))) / (A_avg**2 * Rh_avg**(4./3.)) if A_avg > 0 and Rh_avg > 0 else 0
-            dConv_dQr = 0 if L == 0 else ((2 * Q_r_k / A_down if A_down > 0 else 0) - (2 * Q_r_k / A_up if A_up > 0 else 0)) / L
-            A[row_idx, reach_idx_var] = (1.0 / dt) + dConv_dQr + dFric_dQr
-
-            dPress_dHup = (self.g / L) * ( (B_up / 2.0) * (H_down_eff - H_up_k) - A_avg )
-            dConv_dHup = 0 if L == 0 else ((Q_r_k**2 * B_up) / (L * A_up**2) if A_up > 0 else 0)
-            A[row_idx, up_node_idx] = dConv_dHup + dPress_dHup
-
-            if is_supercritical and h_down_k > yc:
-                # If flow is controlled by critical depth, it's independent of H_down.
-                A[row_idx, down_node_idx] = 0
-            else:
-                dPress_dHdown = (self.g / L) * ( (B_down / 2.0) * (H_down_eff - H_up_k) + A_avg )
-                dConv_dHdown = 0 if L == 0 else -((Q_r_k**2 * B_down) / (L * A_down**2) if A_down > 0 else 0)
-                A[row_idx, down_node_idx] = dConv_dHdown + dPress_dHdown
-
-        # 3. Structure Equations (num_structures equations)
-        for i, struct in enumerate(self.network.structures):
-            up_node_idx = self.var_map[struct.upstream_node.id]
-
-            H_up = H_k[up_node_idx]
-            Q_s = S_k[i] # 'i' is the index in the structures list and S_k array
-
-            # The structure itself adds its equation to the matrix
-            struct.add_to_matrix(A, B, self.var_map, H_up, Q_s)
+            dFric_dQr = np.where(has_friction, (g * A_avg * (n**2 * np.abs(Q_n))) / friction_denom, 0.0)
+            dConv_dQr = (2 * Q_r_k * inv_A_down - 2 * Q_r_k * inv_A_up) * inv_L
+
+            dPress_dHup = (g / L) * ((B_up / 2.0) * dH - A_avg)
+            dConv_dHup = Q_sq * B_up * inv_L * inv_A_up**2
+
+            # If flow is controlled by critical depth, it's independent of H_down.
+            dPress_dHdown = (g / L) * ((B_down / 2.0) * dH + A_avg)
+            dConv_dHdown = -Q_sq * B_down * inv_L * inv_A_down**2
+            dF_dHdown = np.where(is_capped, 0.0, dConv_dHdown + dPress_dHdown)
+
+        # Dry reaches: F = Q_r = 0
+        B[rows[is_dry]] = Q_r_k[is_dry]
+        A[rows[is_dry], rows[is_dry]] = 1.0
+
+        rows_w = rows[wet]
+        B[rows_w] = (time_term + conv_term + pressure_term + friction_term)[wet]
+        A[rows_w, rows_w] = ((1.0 / dt) + dConv_dQr + dFric_dQr)[wet]
+        A[rows_w, up[wet]] = (dConv_dHup + dPress_dHup)[wet]
+        A[rows_w, down[wet]] = dF_dHdown[wet]
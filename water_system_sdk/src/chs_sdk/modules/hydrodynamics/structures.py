@@ -1,12 +1,14 @@
 import uuid
 from abc import ABC, abstractmethod
-from .node import Node
+from .node import Node, PackedAttribute
 
 class BaseStructure(ABC):
     """
     Abstract base class for a hydraulic structure connecting two nodes.
     A structure acts as an internal boundary condition.
     """
+    discharge = PackedAttribute()
+
     def __init__(self, name: str, upstream_node: Node, downstream_node: Node, **kwargs):
         self.id = uuid.uuid4()
         self.name = name
@@ -1,20 +1,43 @@
 import numpy as np
 import logging
 from typing import Optional
+from numba import cuda
 # Use a relative import to access the mesh module within the same package
 from .mesh import UnstructuredMesh
+from . import cuda_kernels
+
+try:
+    import cupy  # type: ignore
+    import cupyx  # type: ignore
+except ImportError:
+    # CuPy is only required for the 'cupy' backend.
+    cupy = None
+    cupyx = None
 
 logger = logging.getLogger(__name__)
 
-class GPUDataManager: # Note: Class name is now a misnomer, but we keep it for consistency with the plan.
+# Default wet/dry depth threshold for each supported state precision. In FP32
+# a 1e-6 m depth is at round-off level for typical water levels.
+DRY_TOLERANCE = {
+    np.dtype(np.float32): 1e-4,
+    np.dtype(np.float64): 1e-6,
+}
+
+class GPUDataManager:
     """
-    Manages the state variables of the hydrodynamic simulation on the CPU.
+    Manages the state variables of the hydrodynamic simulation.
 
     This class holds all the dynamic (e.g., water depth) and static (e.g.,
-    bed elevation) variables required for the solver, stored as NumPy arrays.
+    bed elevation) variables required for the solver. With the default
+    'numpy' backend they are stored as NumPy arrays on the CPU. With the
+    'cupy' backend they are stored as CuPy arrays, and with the 'cuda'
+    backend as Numba device arrays, in GPU memory together with device
+    copies of the mesh arrays used by the solver kernels. The 'cuda' backend
+    only needs Numba and falls back to 'numpy' when no CUDA device is found.
     """
 
-    def __init__(self, mesh: UnstructuredMesh, manning_n: float = 0.03, initial_h: float = 0.01, bed_elevation: Optional[np.ndarray] = None):
+    def __init__(self, mesh: UnstructuredMesh, manning_n: float = 0.03, initial_h: float = 0.01, bed_elevation: Optional[np.ndarray] = None,
+                 backend: str = 'numpy', dtype=np.float32, dry_tolerance: Optional[float] = None):
         """
         Initializes the data manager and allocates memory for state variables.
 
@@ -23,15 +46,32 @@ class GPUDataManager: # Note: Class name is now a misnomer, but we keep it for c
             manning_n (float or np.ndarray): The Manning's roughness coefficient.
             initial_h (float): The initial water depth across the domain.
             bed_elevation (np.ndarray, optional): Array of bed elevations for each cell.
+            backend (str): 'numpy' (CPU), 'cupy' (GPU, requires CuPy and a CUDA
+                device) or 'cuda' (GPU through Numba device arrays).
+            dtype: Floating point precision of the state and of the mesh arrays
+                used by the solver kernels, np.float32 (default) or np.float64.
+            dry_tolerance (float, optional): Depth below which a cell is treated
+                as dry. Defaults to a value suited to `dtype`.
         """
-        logger.info("Initializing DataManager for CPU...")
+        if backend not in ('numpy', 'cupy', 'cuda'):
+            raise ValueError(f"Unknown backend '{backend}'. Expected 'numpy', 'cupy' or 'cuda'.")
+        if backend == 'cupy' and cupy is None:
+            raise ImportError("The 'cupy' backend requires CuPy to be installed.")
+        if backend == 'cuda' and not cuda.is_available():
+            logger.warning("No CUDA device available, falling back to the 'numpy' backend.")
+            backend = 'numpy'
+        dtype = np.dtype(dtype)
+        if dtype not in DRY_TOLERANCE:
+            raise ValueError(f"Unsupported dtype '{dtype}'. Expected float32 or float64.")
+        logger.info(f"Initializing DataManager with '{backend}' backend...")
         self.mesh = mesh
+        self.backend = backend
+        self.dtype = dtype
+        self.dry_tolerance = DRY_TOLERANCE[dtype] if dry_tolerance is None else dry_tolerance
         num_cells = self.mesh.num_cells
 
         # --- Static variables (mesh properties) ---
         self.z: np.ndarray
-        # Use float32 for memory efficiency
-        dtype = np.float32
 
         if bed_elevation is None:
             self.z = np.zeros(num_cells, dtype=dtype)
@@ -49,11 +89,11 @@ class GPUDataManager: # Note: Class name is now a misnomer, but we keep it for c
 
         # --- Dynamic variables (state variables) ---
 
-        self.h = np.full(num_cells, initial_h, dtype=dtype)
-        self.h = np.maximum(self.h, 0.0)
-
-        self.hu = np.zeros(num_cells, dtype=dtype)
-        self.hv = np.zeros(num_cells, dtype=dtype)
+        # Conserved variables packed per cell as U[:, (h, hu, hv)], so the
+        # solver kernels gather one contiguous row per cell. h, hu and hv are
+        # column views of U.
+        self.U = np.zeros((num_cells, 3), dtype=dtype)
+        self.U[:, 0] = max(initial_h, 0.0)
 
         # --- Derived quantities ---
         self.wse = self.z + self.h
@@ -61,8 +101,119 @@ class GPUDataManager: # Note: Class name is now a misnomer, but we keep it for c
         # --- Source Term variables ---
         self.source_terms = np.zeros((num_cells, 3), dtype=dtype)
 
+        # --- Mesh arrays used by the solver kernels ---
+        self.edge_to_cell = mesh.edge_to_cell
+        self.edge_geometry = mesh.edge_geometry.astype(dtype, copy=False)
+        self.cell_areas = mesh.cell_areas.astype(dtype, copy=False)
+        self.cell_edge_ptr = mesh.cell_edge_ptr
+        self.cell_edges = mesh.cell_edges
+        self.cell_edge_signs = mesh.cell_edge_signs.astype(dtype, copy=False)
+
+        if self.backend == 'cupy':
+            for name in ('z', 'n', 'U', 'wse', 'source_terms',
+                         'edge_to_cell', 'edge_geometry', 'cell_areas',
+                         'cell_edge_ptr', 'cell_edges', 'cell_edge_signs'):
+                setattr(self, name, cupy.asarray(getattr(self, name)))
+        elif self.backend == 'cuda':
+            for name in ('z', 'n', 'U', 'wse', 'source_terms',
+                         'edge_to_cell', 'edge_geometry', 'cell_areas',
+                         'cell_edge_ptr', 'cell_edges', 'cell_edge_signs'):
+                setattr(self, name, cuda.to_device(np.ascontiguousarray(getattr(self, name))))
+
         logger.info("DataManager initialized successfully.")
 
+    @property
+    def h(self):
+        """Water depth (view of U[:, 0])."""
+        return self.U[:, 0]
+
+    @h.setter
+    def h(self, value):
+        self.U[:, 0] = value
+
+    @property
+    def hu(self):
+        """x-discharge per unit width (view of U[:, 1])."""
+        return self.U[:, 1]
+
+    @hu.setter
+    def hu(self, value):
+        self.U[:, 1] = value
+
+    @property
+    def hv(self):
+        """y-discharge per unit width (view of U[:, 2])."""
+        return self.U[:, 2]
+
+    @hv.setter
+    def hv(self, value):
+        self.U[:, 2] = value
+
+    @property
+    def on_device(self) -> bool:
+        """Whether the state lives in GPU memory (and is advanced with the CUDA kernels)."""
+        return self.backend != 'numpy'
+
+    @property
+    def xp(self):
+        """The array module (numpy or cupy) backing the state arrays; None for 'cuda'."""
+        if self.backend == 'cuda':
+            return None
+        return cupy if self.backend == 'cupy' else np
+
+    def empty(self, shape):
+        """Allocates an uninitialized work array of the state dtype on the backend."""
+        if self.backend == 'cuda':
+            return cuda.device_array(shape, dtype=self.dtype)
+        return self.xp.empty(shape, dtype=self.dtype)
+
+    def asnumpy(self, array) -> np.ndarray:
+        """Returns a host (NumPy) view or copy of a state array."""
+        if self.backend == 'cuda':
+            return array.copy_to_host()
+        return cupy.asnumpy(array) if self.backend == 'cupy' else array
+
+    def take(self, array, indices) -> np.ndarray:
+        """Returns `array[indices]` as a host (NumPy) array."""
+        if self.backend == 'cuda':
+            return array.copy_to_host()[indices]
+        if self.backend == 'cupy':
+            return cupy.asnumpy(array[cupy.asarray(indices)])
+        return array[indices]
+
+    def max(self, array) -> float:
+        """Maximum of a 1D array."""
+        if self.backend == 'cuda':
+            return float(cuda_kernels.max_reduce(array))
+        return float(array.max())
+
+    def add_source(self, cell_indices, component: int, values):
+        """Accumulates `values` into `source_terms[cell_indices, component]` (unbuffered, like np.add.at)."""
+        if self.backend == 'cuda':
+            cell_indices = np.ascontiguousarray(cell_indices, dtype=np.int64)
+            values = np.ascontiguousarray(np.broadcast_to(values, cell_indices.shape), dtype=self.dtype)
+            cuda_kernels.add_source_kernel[cuda_kernels.blocks_for(len(cell_indices)), cuda_kernels.THREADS_PER_BLOCK](
+                self.source_terms, cell_indices, component, values
+            )
+        elif self.backend == 'cupy':
+            cupyx.scatter_add(self.source_terms, (cupy.asarray(cell_indices), component), cupy.asarray(values))
+        else:
+            np.add.at(self.source_terms, (cell_indices, component), values)
+
+    def clear_sources(self):
+        """Resets all source terms to zero."""
+        if self.backend == 'cuda':
+            num_cells = self.mesh.num_cells
+            cuda_kernels.clear_kernel[cuda_kernels.blocks_for(num_cells), cuda_kernels.THREADS_PER_BLOCK](self.source_terms)
+        else:
+            self.source_terms.fill(0)
+
     def update_wse(self):
         """Updates the water surface elevation based on the current water depth."""
-        self.wse = self.z + self.h
+        if self.backend == 'cuda':
+            num_cells = self.mesh.num_cells
+            cuda_kernels.update_wse_kernel[cuda_kernels.blocks_for(num_cells), cuda_kernels.THREADS_PER_BLOCK](
+                self.z, self.U, self.wse
+            )
+        else:
+            self.wse = self.z + self.h
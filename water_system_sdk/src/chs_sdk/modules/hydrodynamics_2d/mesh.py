@@ -1,6 +1,7 @@
 import meshio  # type: ignore
 import numpy as np
 import logging
+from numba import njit, prange
 from typing import Tuple
 
 logger = logging.getLogger(__name__)
@@ -35,6 +36,59 @@ def load_mesh(mesh_file_path: str) -> Tuple[np.ndarray, np.ndarray]:
     return points, cells
 
 
+@njit(parallel=True, cache=True)
+def _compute_cell_geometry(nodes, cells, cell_centers, cell_areas):
+    """
+    Computes the centroid and (Shoelace) area of every triangle in one
+    parallel pass, writing into preallocated arrays.
+    """
+    for c in prange(cells.shape[0]):
+        x1, y1 = nodes[cells[c, 0], 0], nodes[cells[c, 0], 1]
+        x2, y2 = nodes[cells[c, 1], 0], nodes[cells[c, 1], 1]
+        x3, y3 = nodes[cells[c, 2], 0], nodes[cells[c, 2], 1]
+        cell_centers[c, 0] = (x1 + x2 + x3) / 3.0
+        cell_centers[c, 1] = (y1 + y2 + y3) / 3.0
+        cell_areas[c] = 0.5 * abs(x1 * (y2 - y3) + x2 * (y3 - y1) + x3 * (y1 - y2))
+
+
+@njit(parallel=True, cache=True)
+def _compute_edge_geometry(nodes, edges, edge_to_cell, cell_centers, edge_normals, edge_lengths):
+    """
+    Computes the unit normal (pointing away from the first adjacent cell) and
+    the length of every edge in one parallel pass, writing into preallocated
+    arrays.
+    """
+    for e in prange(edges.shape[0]):
+        x1, y1 = nodes[edges[e, 0], 0], nodes[edges[e, 0], 1]
+        x2, y2 = nodes[edges[e, 1], 0], nodes[edges[e, 1], 1]
+        nx = -(y2 - y1)
+        ny = x2 - x1
+
+        c0 = edge_to_cell[e, 0]
+        to_cell0_x = cell_centers[c0, 0] - 0.5 * (x1 + x2)
+        to_cell0_y = cell_centers[c0, 1] - 0.5 * (y1 + y2)
+        if nx * to_cell0_x + ny * to_cell0_y > 1e-9:
+            nx = -nx
+            ny = -ny
+
+        length = np.sqrt(nx * nx + ny * ny)
+        edge_lengths[e] = length
+        edge_normals[e, 0] = nx / length
+        edge_normals[e, 1] = ny / length
+
+
+@njit(cache=True)
+def _fill_edge_to_cell(cell_to_edge, edge_to_cell):
+    """Records the (up to two) cells adjacent to each edge."""
+    for i_cell in range(cell_to_edge.shape[0]):
+        for i_local_edge in range(3):
+            edge_index = cell_to_edge[i_cell, i_local_edge]
+            if edge_to_cell[edge_index, 0] == -1:
+                edge_to_cell[edge_index, 0] = i_cell
+            else:
+                edge_to_cell[edge_index, 1] = i_cell
+
+
 class UnstructuredMesh:
     """
     Manages unstructured mesh data for hydrodynamic simulations on the CPU.
@@ -59,8 +113,9 @@ class UnstructuredMesh:
         self.num_cells = self.cells.shape[0]
 
         logger.info("Computing cell properties...")
-        self.cell_centers = self.nodes[self.cells].mean(axis=1)
-        self.cell_areas = self._compute_cell_areas()
+        self.cell_centers = np.empty((self.num_cells, 2), dtype=np.float64)
+        self.cell_areas = np.empty(self.num_cells, dtype=np.float64)
+        _compute_cell_geometry(self.nodes, self.cells, self.cell_centers, self.cell_areas)
 
         logger.info("Computing edge connectivity and properties...")
         (
@@ -71,25 +126,19 @@ class UnstructuredMesh:
 
         self.num_edges = self.edges.shape[0]
 
-        self.edge_normals = self._compute_edge_normals()
-        self.edge_lengths = np.linalg.norm(self.edge_normals, axis=1)
+        # Cell-to-edge adjacency in CSR form, for race-free per-cell flux gathering
+        self.cell_edge_ptr, self.cell_edges, self.cell_edge_signs = self._compute_cell_edge_csr()
 
-        # Normalize the normal vectors to get unit normals
-        self.edge_normals /= self.edge_lengths[:, np.newaxis]
+        # Unit normals and edge lengths, packed per edge as (nx, ny, length) so
+        # the flux kernels read one row per edge
+        self.edge_geometry = np.empty((self.num_edges, 3), dtype=np.float64)
+        self.edge_normals = self.edge_geometry[:, :2]
+        self.edge_lengths = self.edge_geometry[:, 2]
+        _compute_edge_geometry(self.nodes, self.edges, self.edge_to_cell, self.cell_centers,
+                               self.edge_normals, self.edge_lengths)
 
         logger.info(f"Mesh initialization complete. Found {self.num_edges} unique edges.")
 
-    def _compute_cell_areas(self) -> np.ndarray:
-        """Computes the area of each triangular cell using the Shoelace formula."""
-        p1 = self.nodes[self.cells[:, 0]]
-        p2 = self.nodes[self.cells[:, 1]]
-        p3 = self.nodes[self.cells[:, 2]]
-
-        areas = 0.5 * np.abs(p1[:, 0]*(p2[:, 1] - p3[:, 1]) +
-                                p2[:, 0]*(p3[:, 1] - p1[:, 1]) +
-                                p3[:, 0]*(p1[:, 1] - p2[:, 1]))
-        return np.asarray(areas, dtype=np.float64)
-
     def _compute_edge_connectivity(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         Builds edge connectivity information from the cell connectivity array.
@@ -108,38 +157,18 @@ class UnstructuredMesh:
 
         num_edges = unique_edges.shape[0]
         edge_to_cell = np.full((num_edges, 2), -1, dtype=np.int32)
-
-        for i_cell in range(self.num_cells):
-            for i_local_edge in range(3):
-                edge_index = cell_to_edge[i_cell, i_local_edge]
-                if edge_to_cell[edge_index, 0] == -1:
-                    edge_to_cell[edge_index, 0] = i_cell
-                else:
-                    edge_to_cell[edge_index, 1] = i_cell
+        _fill_edge_to_cell(np.ascontiguousarray(cell_to_edge), edge_to_cell)
 
         return unique_edges, edge_to_cell, cell_to_edge
 
-    def _compute_edge_normals(self) -> np.ndarray:
+    def _compute_cell_edge_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        Computes the normal vector for each edge.
+        Lists the edges of cell c as cell_edges[cell_edge_ptr[c]:cell_edge_ptr[c + 1]].
+        cell_edge_signs is +1 where the cell is on the right of the edge (the
+        edge flux flows into it) and -1 where it is on the left.
         """
-        p1 = self.nodes[self.edges[:, 0]]
-        p2 = self.nodes[self.edges[:, 1]]
-
-        dx = p2[:, 0] - p1[:, 0]
-        dy = p2[:, 1] - p1[:, 1]
-
-        normals = np.hstack([-dy[:, np.newaxis], dx[:, np.newaxis]])
-
-        cell0_idx = self.edge_to_cell[:, 0]
-        cell0_centers = self.cell_centers[cell0_idx]
-
-        edge_midpoints = (p1 + p2) / 2
-        vec_to_cell0 = cell0_centers - edge_midpoints
-
-        dot_product = np.sum(normals * vec_to_cell0, axis=1)
-
-        mask = dot_product > 1e-9
-        normals[mask] *= -1
-
-        return np.asarray(normals, dtype=np.float64)
+        cell_edge_ptr = np.arange(0, 3 * self.num_cells + 1, 3, dtype=np.int32)
+        cell_edges = np.ascontiguousarray(self.cell_to_edge, dtype=np.int32).ravel()
+        owner = np.repeat(np.arange(self.num_cells, dtype=np.int32), 3)
+        cell_edge_signs = np.where(self.edge_to_cell[cell_edges, 1] == owner, 1.0, -1.0)
+        return cell_edge_ptr, cell_edges, cell_edge_signs
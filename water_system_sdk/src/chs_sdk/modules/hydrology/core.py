@@ -1,4 +1,5 @@
 import numpy as np
+from collections import deque
 from .utils.file_parsers import (
     load_topology_from_json,
     load_parameters_from_json,
@@ -129,6 +130,7 @@ class Basin:
 
     def _build_basin(self):
         """Constructs the basin network from the loaded configuration."""
+        sinks = set(self.topology_data["sinks"])
         for element_data in self.topology_data["elements"]:
             element_id = element_data["id"]
             params = self.params_data.get(element_id, {})
@@ -148,7 +150,7 @@ class Basin:
 
             # Create Reaches for routing
             downstream_id = element_data["downstream"]
-            if downstream_id and downstream_id not in self.topology_data["sinks"]:
+            if downstream_id and downstream_id not in sinks:
                 self.reaches[element_id] = Reach(
                     from_id=element_id,
                     to_id=downstream_id,
@@ -165,10 +167,10 @@ class Basin:
             graph[el_id].append(reach.to_id)
             in_degree[reach.to_id] += 1
 
-        queue = [el_id for el_id in self.elements if in_degree[el_id] == 0]
+        queue = deque(el_id for el_id in self.elements if in_degree[el_id] == 0)
 
         while queue:
-            u = queue.pop(0)
+            u = queue.popleft()
             self.simulation_order.append(u)
 
             if u in graph:
@@ -1,5 +1,25 @@
 import json
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    # orjson is optional; it only speeds up parsing of large input files.
+    orjson = None
+
+def _load_json(filepath):
+    """Parses a JSON file, with orjson when it is installed."""
+    if orjson is None:
+        with open(filepath, 'r') as f:
+            return json.load(f)
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # The standard library also accepts NaN/Infinity literals and
+        # arbitrarily large integers, which orjson rejects.
+        return json.loads(data)
+
 def load_topology_from_json(filepath):
     """
     Loads basin topology from a JSON file.
@@ -10,8 +30,7 @@ def load_topology_from_json(filepath):
     Returns:
         dict: The loaded topology data.
     """
-    with open(filepath, 'r') as f:
-        topology = json.load(f)
+    topology = _load_json(filepath)
     # Basic validation could be added here
     return topology
 
@@ -25,8 +44,7 @@ def load_timeseries_from_json(filepath):
     Returns:
         dict: The loaded time series data.
     """
-    with open(filepath, 'r') as f:
-        timeseries = json.load(f)
+    timeseries = _load_json(filepath)
     # Basic validation could be added here
     return timeseries
 
@@ -40,7 +58,6 @@ def load_parameters_from_json(filepath):
     Returns:
         dict: The loaded parameters data.
     """
-    with open(filepath, 'r') as f:
-        parameters = json.load(f)
+    parameters = _load_json(filepath)
     # Basic validation could be added here
     return parameters
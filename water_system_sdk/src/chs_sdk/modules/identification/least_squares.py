@@ -15,7 +15,7 @@ def identify_time_constant(storage_data: np.ndarray, inflow_data: np.ndarray, dt
     Let p = [1/T, 1] (parameters to be identified)
 
     y = x @ p
-    We will identify p using least squares: p = (X.T @ X)^-1 @ X.T @ Y
+    We will identify p using least squares: p = argmin ||X @ p - Y||
 
     Args:
         storage_data (np.ndarray): A time series of storage values.
@@ -34,15 +34,11 @@ def identify_time_constant(storage_data: np.ndarray, inflow_data: np.ndarray, dt
     # Prepare the Y vector and X matrix
     Y = storage_data[1:] - storage_data[:-1]
 
-    # Reshape storage_data to be a column vector for the matrix
-    storage_col = -dt * storage_data[:-1].reshape(-1, 1)
-    inflow_col = dt * inflow_data[:-1].reshape(-1, 1)
+    X = np.column_stack((-dt * storage_data[:-1], dt * inflow_data[:-1]))
 
-    X = np.hstack([storage_col, inflow_col])
-
-    # Solve for parameters p using the pseudo-inverse
+    # Solve for parameters p directly on the (N, 2) system (SVD-based, no normal equations)
     try:
-        p = np.linalg.pinv(X.T @ X) @ X.T @ Y
+        p, *_ = np.linalg.lstsq(X, Y, rcond=None)
     except np.linalg.LinAlgError:
         raise RuntimeError("Could not solve the least squares problem. The data may be linearly dependent.")
 
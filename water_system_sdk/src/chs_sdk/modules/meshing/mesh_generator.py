@@ -1,6 +1,10 @@
+import hashlib
+import os
+import tempfile
 import numpy as np
 import triangle as tr  # type: ignore
 import logging
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
@@ -17,10 +21,50 @@ class MeshGenerator:
     - 'holes': A NumPy array of shape (K, 2) with coordinates of points inside holes.
     - 'regions': A list of lists, where each inner list contains [x, y, attribute, max_area].
                 This is used for defining regions with specific attributes and mesh size constraints.
+
+    Args:
+        cache_dir (str, optional): If given, generated meshes are cached in this
+            directory as .npz files keyed by a hash of the PSLG and the meshing
+            options, and also kept in memory, so meshing the same PSLG again
+            (e.g. across the runs of a parameter sweep) skips triangulation.
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self._memory_cache = {}
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _cache_key(pslg_data, opts):
+        """Hash of the PSLG arrays and the triangle options string."""
+        digest = hashlib.blake2b(opts.encode())
+        for name in sorted(pslg_data):
+            array = np.ascontiguousarray(pslg_data[name])
+            digest.update(f"{name}:{array.dtype.str}:{array.shape}".encode())
+            digest.update(array.tobytes())
+        return digest.hexdigest()
+
+    def _load_cached(self, key):
+        mesh = self._memory_cache.get(key)
+        if mesh is None:
+            path = os.path.join(self.cache_dir, f"{key}.npz")
+            if not os.path.exists(path):
+                return None
+            with np.load(path) as data:
+                mesh = {name: data[name] for name in data.files}
+            self._memory_cache[key] = mesh
+            logger.info(f"Loaded cached mesh from {path}")
+        # Callers get their own arrays, so they cannot alter the cached mesh.
+        return {name: array.copy() for name, array in mesh.items()}
+
+    def _store_cached(self, key, mesh):
+        self._memory_cache[key] = {name: np.array(value) for name, value in mesh.items()}
+        # Write to a temporary file first so concurrent runs never read a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".npz")
+        with os.fdopen(fd, 'wb') as f:
+            np.savez_compressed(f, **self._memory_cache[key])
+        os.replace(tmp_path, os.path.join(self.cache_dir, f"{key}.npz"))
 
     def generate(self, pslg_data, max_area=None, quality_meshing=True):
         """
@@ -47,7 +91,14 @@ class MeshGenerator:
         if 'vertices' not in pslg_data and 'segments' not in pslg_data:
             raise ValueError("pslg_data must contain at least 'vertices' or 'segments'.")
 
-        mesh = tr.triangulate(pslg_data, opts=opts)
+        if self.cache_dir is None:
+            return tr.triangulate(pslg_data, opts=opts)
+
+        key = self._cache_key(pslg_data, opts)
+        mesh = self._load_cached(key)
+        if mesh is None:
+            mesh = tr.triangulate(pslg_data, opts=opts)
+            self._store_cached(key, mesh)
         return mesh
 
     def write_msh(self, mesh_data, filename):
@@ -63,8 +114,8 @@ class MeshGenerator:
         if 'vertices' not in mesh_data or 'triangles' not in mesh_data:
             raise ValueError("mesh_data must contain 'vertices' and 'triangles' keys.")
 
-        vertices = mesh_data['vertices']
-        triangles = mesh_data['triangles']
+        vertices = np.asarray(mesh_data['vertices'], dtype=np.float64)
+        triangles = np.asarray(mesh_data['triangles'], dtype=np.int64)
 
         with open(filename, 'w') as f:
             # Header
@@ -75,8 +126,12 @@ class MeshGenerator:
             # Nodes
             f.write("$Nodes\n")
             f.write(f"{len(vertices)}\n")
-            for i, v in enumerate(vertices):
-                f.write(f"{i + 1} {v[0]} {v[1]} 0.0\n")
+            # Each block is formatted with a single %-operation over the flattened
+            # columns instead of one f.write() per entity.
+            node_fmt = "%d %r %r 0.0\n"
+            node_ids = np.arange(1, len(vertices) + 1, dtype=object)
+            node_data = np.column_stack((node_ids, vertices[:, :2].astype(object)))
+            f.write(node_fmt * len(vertices) % tuple(node_data.ravel().tolist()))
             f.write("$EndNodes\n")
 
             # Elements
@@ -88,9 +143,68 @@ class MeshGenerator:
             physical_entity = 1  # Default physical group
             geometrical_entity = 1 # Default geometrical entity
 
-            for i, t in enumerate(triangles):
-                # Gmsh elements are 1-based
-                f.write(f"{i + 1} 2 {num_tags} {physical_entity} {geometrical_entity} {t[0] + 1} {t[1] + 1} {t[2] + 1}\n")
+            # Gmsh elements and nodes are 1-based
+            element_fmt = f"%d 2 {num_tags} {physical_entity} {geometrical_entity} %d %d %d\n"
+            element_data = np.column_stack((np.arange(1, len(triangles) + 1), triangles[:, :3] + 1))
+            f.write(element_fmt * len(triangles) % tuple(element_data.ravel().tolist()))
             f.write("$EndElements\n")
 
         logger.info(f"Mesh successfully written to {filename}")
+
+    def write_msh_binary(self, mesh_data, filename):
+        """
+        Writes the mesh data to a file in Gmsh MSH version 2 binary format.
+
+        Node and element blocks are written as packed native-endian records
+        straight from NumPy arrays, which is much faster than `write_msh` for
+        large meshes. The nodes, elements and tags are the same as in the
+        ASCII file.
+
+        Args:
+            mesh_data (dict): A dictionary containing the mesh data, typically the
+                              output from the triangle.triangulate function.
+                              It must contain 'vertices' and 'triangles' keys.
+            filename (str): The path to the output .msh file.
+        """
+        if 'vertices' not in mesh_data or 'triangles' not in mesh_data:
+            raise ValueError("mesh_data must contain 'vertices' and 'triangles' keys.")
+
+        vertices = np.asarray(mesh_data['vertices'], dtype=np.float64)
+        triangles = np.asarray(mesh_data['triangles'])
+        num_nodes = len(vertices)
+        num_elements = len(triangles)
+
+        with open(filename, 'wb') as f:
+            # Header: the binary integer 1 lets readers detect the byte order.
+            f.write(b"$MeshFormat\n2.2 1 8\n")
+            f.write(np.array([1], dtype=np.int32).tobytes())
+            f.write(b"\n$EndMeshFormat\n")
+
+            # Nodes: one packed (int32 id, float64 x, y, z) record per node
+            nodes = np.zeros(num_nodes, dtype=[('id', np.int32), ('x', np.float64),
+                                               ('y', np.float64), ('z', np.float64)])
+            nodes['id'] = np.arange(1, num_nodes + 1)
+            nodes['x'] = vertices[:, 0]
+            nodes['y'] = vertices[:, 1]
+            f.write(f"$Nodes\n{num_nodes}\n".encode('ascii'))
+            f.write(nodes.tobytes())
+            f.write(b"\n$EndNodes\n")
+
+            # Elements: a single (element type, element count, tag count) header
+            # followed by one (id, tags..., nodes...) int32 row per triangle.
+            num_tags = 2
+            physical_entity = 1  # Default physical group
+            geometrical_entity = 1 # Default geometrical entity
+            elements = np.empty((num_elements, 1 + num_tags + 3), dtype=np.int32)
+            elements[:, 0] = np.arange(1, num_elements + 1)
+            elements[:, 1] = physical_entity
+            elements[:, 2] = geometrical_entity
+            elements[:, 3:] = triangles[:, :3] + 1  # Gmsh nodes are 1-based
+            f.write(f"$Elements\n{num_elements}\n".encode('ascii'))
+            if num_elements:
+                # Element type for a 3-node triangle is 2.
+                f.write(np.array([2, num_elements, num_tags], dtype=np.int32).tobytes())
+                f.write(elements.tobytes())
+            f.write(b"\n$EndElements\n")
+
+        logger.info(f"Mesh successfully written to {filename}")
@@ -1,14 +1,16 @@
 from .base_model import BaseModel
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from typing import Sequence
 import numpy as np
-import time
+from numba import njit, prange
+import math
 
 @dataclass
 class ActuatorState:
     """Represents the state of an actuator."""
     current_setpoint: float = 0.0
     actual_position: float = 0.0
-    last_update_time: float = field(default_factory=time.time)
+    last_update_time: float = 0.0  # Simulation time (s), advanced by ActuatorBase.update
 
 class ActuatorBase(BaseModel):
     """
@@ -38,7 +40,6 @@ class ActuatorBase(BaseModel):
         self.state = ActuatorState(
             current_setpoint=initial_position,
             actual_position=initial_position,
-            last_update_time=time.time() # or a simulation time from context
         )
         self.target_setpoint = initial_position
 
@@ -57,29 +58,26 @@ class ActuatorBase(BaseModel):
         Args:
             dt (float): The time elapsed since the last update (simulation time step).
         """
-        # 1. Apply Deadband: Only update the internal setpoint if the new target is outside the deadband.
-        if abs(self.target_setpoint - self.state.current_setpoint) > self.deadband:
-            self.state.current_setpoint = self.target_setpoint
+        state = self.state
+        state.last_update_time += dt
 
-        # 2. Determine target position considering hysteresis
-        effective_target = self.state.current_setpoint
-        direction_of_travel = np.sign(effective_target - self.state.actual_position)
+        # 1. Apply Deadband: Only update the internal setpoint if the new target is outside the deadband.
+        if abs(self.target_setpoint - state.current_setpoint) > self.deadband:
+            state.current_setpoint = self.target_setpoint
 
-        if direction_of_travel > 0: # Moving "up"
-            effective_target -= self.hysteresis / 2.0
-        elif direction_of_travel < 0: # Moving "down"
-            effective_target += self.hysteresis / 2.0
+        # 2. Determine target position considering hysteresis: the target is
+        # offset by half the hysteresis against the direction of travel.
+        current_pos = state.actual_position
+        travel = state.current_setpoint - current_pos
+        direction_of_travel = math.copysign(1.0, travel) if travel != 0.0 else 0.0
+        effective_target = state.current_setpoint - 0.5 * self.hysteresis * direction_of_travel
 
         # 3. Apply Slew Rate: Calculate the maximum possible change in position
         max_change = self.slew_rate * dt
-        current_pos = self.state.actual_position
-        desired_change = effective_target - current_pos
 
         # 4. Update actual position
-        if abs(desired_change) <= max_change:
-            self.state.actual_position = effective_target
-        else:
-            self.state.actual_position += direction_of_travel * max_change
+        state.actual_position = (effective_target if abs(effective_target - current_pos) <= max_change
+                                 else current_pos + direction_of_travel * max_change)
 
     def get_current_position(self) -> float:
         """Returns the current, actual position of the actuator."""
@@ -92,3 +90,88 @@ class ActuatorBase(BaseModel):
             "current_setpoint": self.state.current_setpoint,
             "actual_position": self.state.actual_position,
         }
+
+
+@njit(parallel=True, cache=True)
+def _update_bank(positions, setpoints, targets, slew_rates, deadbands, hysteresis, dt):
+    """
+    Jitted `ActuatorBase.update` applied to every actuator of a bank, in
+    parallel over actuators. Updates `positions` and `setpoints` in place.
+    """
+    for i in prange(positions.shape[0]):
+        setpoint = setpoints[i]
+        if abs(targets[i] - setpoint) > deadbands[i]:
+            setpoint = targets[i]
+            setpoints[i] = setpoint
+
+        pos = positions[i]
+        travel = setpoint - pos
+        direction = 0.0
+        if travel > 0.0:
+            direction = 1.0
+        elif travel < 0.0:
+            direction = -1.0
+        effective_target = setpoint - 0.5 * hysteresis[i] * direction
+
+        max_change = slew_rates[i] * dt
+        if abs(effective_target - pos) <= max_change:
+            positions[i] = effective_target
+        else:
+            positions[i] = pos + direction * max_change
+
+class ActuatorBank:
+    """
+    A population of actuators with the dynamics of `ActuatorBase` (slew rate,
+    deadband and hysteresis), stored as one array per quantity and stepped
+    together in a single jitted call.
+
+    Args:
+        initial_positions: Initial position of each actuator.
+        slew_rates: Slew rate of each actuator (units/sec), inf for instantaneous.
+        deadbands: Deadband of each actuator.
+        hysteresis: Hysteresis of each actuator.
+    """
+    def __init__(self,
+                 initial_positions: Sequence[float],
+                 slew_rates=float('inf'),
+                 deadbands=0.0,
+                 hysteresis=0.0):
+        self.positions = np.array(initial_positions, dtype=np.float64)
+        n = self.positions.shape[0]
+        self.setpoints = self.positions.copy()
+        self.targets = self.positions.copy()
+        self.slew_rates = np.broadcast_to(np.asarray(slew_rates, dtype=np.float64), n).copy()
+        self.deadbands = np.broadcast_to(np.asarray(deadbands, dtype=np.float64), n).copy()
+        self.hysteresis = np.broadcast_to(np.asarray(hysteresis, dtype=np.float64), n).copy()
+
+        if np.any(self.slew_rates <= 0):
+            raise ValueError("Slew rate must be positive.")
+        if np.any(self.deadbands < 0):
+            raise ValueError("Deadband cannot be negative.")
+        if np.any(self.hysteresis < 0):
+            raise ValueError("Hysteresis cannot be negative.")
+
+    @classmethod
+    def from_actuators(cls, actuators: Sequence[ActuatorBase]) -> "ActuatorBank":
+        """Creates a bank with the parameters and current state of existing actuators."""
+        bank = cls(
+            [a.state.actual_position for a in actuators],
+            slew_rates=[a.slew_rate for a in actuators],
+            deadbands=[a.deadband for a in actuators],
+            hysteresis=[a.hysteresis for a in actuators],
+        )
+        bank.setpoints[:] = [a.state.current_setpoint for a in actuators]
+        bank.targets[:] = [a.target_setpoint for a in actuators]
+        return bank
+
+    def __len__(self) -> int:
+        return self.positions.shape[0]
+
+    def set_targets(self, setpoints):
+        """Sets the target position of every actuator (a scalar or one value per actuator)."""
+        self.targets[:] = setpoints
+
+    def step_all(self, dt: float):
+        """Advances every actuator by dt, like calling `ActuatorBase.update(dt)` on each."""
+        _update_bank(self.positions, self.setpoints, self.targets,
+                     self.slew_rates, self.deadbands, self.hysteresis, float(dt))
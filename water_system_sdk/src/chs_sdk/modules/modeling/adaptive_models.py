@@ -1,3 +1,5 @@
+from bisect import bisect_right
+
 from .integral_plus_delay_model import IntegralPlusDelayModel
 
 class PiecewiseIntegralDelayModel(IntegralPlusDelayModel):
@@ -22,16 +24,20 @@ class PiecewiseIntegralDelayModel(IntegralPlusDelayModel):
         self.model_bank = sorted(model_bank, key=lambda x: x['threshold'])
         if not all(m['T'] == self.model_bank[0]['T'] for m in self.model_bank):
             raise ValueError("All models in the bank must have the same time delay 'T' for this plant model.")
+        # Sorted thresholds and their gains, for a binary search per step.
+        self._thresholds = [m['threshold'] for m in self.model_bank]
+        self._gains = [m['K'] for m in self.model_bank]
 
         initial_model = self.model_bank[0]
         super().__init__(K=initial_model['K'], T=initial_model['T'], dt=dt, initial_value=initial_value, **kwargs)
 
     def _select_model_k(self, scheduling_variable: float) -> float:
-        """Selects the appropriate model gain K from the bank."""
-        for model in self.model_bank:
-            if scheduling_variable < model['threshold']:
-                return model['K']
-        return self.model_bank[-1]['K']
+        """
+        Selects the appropriate model gain K from the bank: that of the first
+        model whose threshold is above the scheduling variable, or of the last.
+        """
+        idx = bisect_right(self._thresholds, scheduling_variable)
+        return self._gains[min(idx, len(self._gains) - 1)]
 
     def step(self, **kwargs):
         """
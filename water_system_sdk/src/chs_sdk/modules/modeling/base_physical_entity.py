@@ -15,6 +15,18 @@ class BasePhysicalEntity(BaseModel):
         self.precision_model = precision_model
         self._active_model: Optional[BaseModel] = self.dynamic_model # Default to dynamic
 
+        # Mode -> (model, bound step/solve method), resolved once so that step()
+        # is a single lookup. Modes without a usable model are left out and
+        # reported by _dispatch_error.
+        self._mode_dispatch = {}
+        if self.steady_model and hasattr(self.steady_model, 'solve'):
+            # Per instructions, steady model has a `solve` method
+            self._mode_dispatch[SimulationMode.STEADY] = (self.steady_model, self.steady_model.solve)
+        if self.dynamic_model:
+            self._mode_dispatch[SimulationMode.DYNAMIC] = (self.dynamic_model, self.dynamic_model.step)
+        if self.precision_model:
+            self._mode_dispatch[SimulationMode.PRECISION] = (self.precision_model, self.precision_model.step)
+
     def step(self, simulation_mode: SimulationMode = SimulationMode.DYNAMIC, **kwargs):
         """
         Delegates the step call to the appropriate internal model based on the
@@ -24,34 +36,26 @@ class BasePhysicalEntity(BaseModel):
             simulation_mode: The current simulation mode (STEADY, DYNAMIC, PRECISION).
             **kwargs: Additional arguments to pass to the model's step/solve method.
         """
-        if simulation_mode == SimulationMode.STEADY:
-            if not self.steady_model:
-                raise NotImplementedError(f"Entity '{self.name}' does not have a steady-state model.")
-            self._active_model = self.steady_model
-            # Per instructions, steady model has a `solve` method
-            if hasattr(self._active_model, 'solve'):
-                self._active_model.solve(**kwargs)
-            else:
-                raise AttributeError(f"Steady model for '{self.name}' does not have a 'solve' method.")
-
-        elif simulation_mode == SimulationMode.DYNAMIC:
-            if not self.dynamic_model:
-                raise NotImplementedError(f"Entity '{self.name}' does not have a dynamic model.")
-            self._active_model = self.dynamic_model
-            self._active_model.step(**kwargs)
-
-        elif simulation_mode == SimulationMode.PRECISION:
-            if not self.precision_model:
-                raise NotImplementedError(f"Entity '{self.name}' does not have a precision model.")
-            self._active_model = self.precision_model
-            self._active_model.step(**kwargs)
-
-        else:
-            raise ValueError(f"Unknown simulation mode: {simulation_mode}")
+        dispatch = self._mode_dispatch.get(simulation_mode)
+        if dispatch is None:
+            raise self._dispatch_error(simulation_mode)
+        self._active_model, run = dispatch
+        run(**kwargs)
 
         # The entity's output is the output of the active model
-        if self._active_model:
-            self.output = self._active_model.output
+        self.output = self._active_model.output
+
+    def _dispatch_error(self, simulation_mode) -> Exception:
+        """The error for a simulation mode that has no usable model."""
+        if simulation_mode == SimulationMode.STEADY:
+            if not self.steady_model:
+                return NotImplementedError(f"Entity '{self.name}' does not have a steady-state model.")
+            return AttributeError(f"Steady model for '{self.name}' does not have a 'solve' method.")
+        if simulation_mode == SimulationMode.DYNAMIC:
+            return NotImplementedError(f"Entity '{self.name}' does not have a dynamic model.")
+        if simulation_mode == SimulationMode.PRECISION:
+            return NotImplementedError(f"Entity '{self.name}' does not have a precision model.")
+        return ValueError(f"Unknown simulation mode: {simulation_mode}")
 
     def get_state(self):
         """
@@ -1,5 +1,5 @@
-import collections
 from dataclasses import dataclass
+import numpy as np
 from .base_model import BaseModel
 from chs_sdk.core.datastructures import State, Input
 
@@ -34,8 +34,9 @@ class IntegralDelayModel(BaseModel):
         # Calculate the number of time steps for the delay
         self.delay_steps = int(round(delay / dt))
 
-        # Use a deque as a simple and efficient FIFO buffer
-        self.buffer: collections.deque = collections.deque([initial_value] * self.delay_steps, maxlen=self.delay_steps)
+        # Preallocated ring buffer of the delayed values; _head indexes the oldest one
+        self._buf = np.full(self.delay_steps, initial_value, dtype=np.float64)
+        self._head = 0
 
         self.input: IntegralDelayInput = IntegralDelayInput(inflow=initial_value)
         self.state: IntegralDelayState = IntegralDelayState(output=initial_value)
@@ -47,16 +48,14 @@ class IntegralDelayModel(BaseModel):
         It takes the current input, adds it to the buffer, and outputs the
         value that has finished its delay period.
         """
-        # The oldest value in the buffer is the output for this step
-        # If buffer is empty (delay is 0), this should not happen with proper init.
-        # But as a safeguard, we could return current input.
-        if not self.buffer:
+        # The oldest value in the buffer is the output for this step and is
+        # overwritten by the current input. With no delay the input passes through.
+        if self.delay_steps == 0:
             output_value = self.input.inflow
         else:
-            output_value = self.buffer.popleft()
-
-        # Add the current input to the end of the buffer
-        self.buffer.append(self.input.inflow)
+            output_value = float(self._buf[self._head])
+            self._buf[self._head] = self.input.inflow
+            self._head = (self._head + 1) % self.delay_steps
 
         self.state.output = output_value
         self.output = output_value
@@ -66,5 +65,51 @@ class IntegralDelayModel(BaseModel):
         # The 'state' of this model is its output and the internal buffer content
         return {
             "output": self.state.output,
-            "buffer": list(self.buffer)
+            "buffer": np.roll(self._buf, -self._head).tolist()
+        }
+
+class BatchIntegralDelay:
+    """
+    Pure time delays of many signals with the same delay, stepped together.
+
+    Equivalent to one IntegralDelayModel per channel, with the delayed values
+    of all channels held in one (n_channels, delay_steps) ring buffer.
+
+    Args:
+        num_channels (int): Number of delayed signals.
+        delay (float): The total delay time.
+        dt (float): The simulation time step.
+        initial_value: Initial output of each channel (scalar or per channel).
+    """
+    def __init__(self, num_channels: int, delay: float, dt: float, initial_value=0.0):
+        if dt <= 0:
+            raise ValueError("dt must be positive.")
+        if delay < 0:
+            raise ValueError("delay cannot be negative.")
+        self.num_channels = num_channels
+        self.delay_steps = int(round(delay / dt))
+        self._buf = np.empty((num_channels, self.delay_steps), dtype=np.float64)
+        self._buf[:] = np.asarray(initial_value, dtype=np.float64).reshape(-1, 1)
+        self._head = 0
+        self.output = np.zeros(num_channels)
+        self.output[:] = initial_value
+
+    def step(self, inflow: np.ndarray) -> np.ndarray:
+        """Pushes the current input of every channel and returns the delayed outputs."""
+        inflow = np.asarray(inflow, dtype=np.float64)
+        if inflow.shape != (self.num_channels,):
+            raise ValueError(f"inflow must have shape ({self.num_channels},).")
+        if self.delay_steps == 0:
+            self.output = inflow.copy()
+        else:
+            self.output = self._buf[:, self._head].copy()
+            self._buf[:, self._head] = inflow
+            self._head = (self._head + 1) % self.delay_steps
+        return self.output
+
+    def get_state(self):
+        """Returns the outputs and the buffers (oldest value first) of all channels."""
+        return {
+            "output": self.output.tolist(),
+            "buffer": np.roll(self._buf, -self._head, axis=1).tolist()
         }
@@ -1,3 +1,4 @@
+import numpy as np
 from .base_model import BaseModel
 
 class FirstOrderSystem(BaseModel):
@@ -29,3 +30,39 @@ class FirstOrderSystem(BaseModel):
 
     def get_state(self):
         return {"output": self.output}
+
+class BatchFirstOrderSystem:
+    """
+    Many independent FirstOrderSystem channels, y(k) = a1 * y(k-1) + b1 * u(k-1),
+    stepped together with array operations.
+
+    Args:
+        a1, b1: Per channel coefficients.
+        initial_output: Initial output of each channel (scalar or per channel).
+    """
+    def __init__(self, a1: np.ndarray, b1: np.ndarray, initial_output=0.0):
+        self.a1 = np.asarray(a1, dtype=np.float64)
+        self.b1 = np.asarray(b1, dtype=np.float64)
+        if self.a1.shape != self.b1.shape or self.a1.ndim != 1:
+            raise ValueError("a1 and b1 must be 1D arrays of the same length.")
+        self.prev_inflow = np.zeros_like(self.a1)
+        self.prev_outflow = np.zeros_like(self.a1)
+        self.prev_outflow[:] = initial_output
+        self.output = self.prev_outflow.copy()
+
+    def step(self, inflow: np.ndarray) -> np.ndarray:
+        """
+        Calculates the next output of every channel.
+        Args:
+            inflow (np.ndarray): The inputs of the channels at time k, u(k).
+        """
+        current_outflow = self.a1 * self.prev_outflow + self.b1 * self.prev_inflow
+
+        # Update state for next iteration
+        self.prev_inflow = np.array(inflow, dtype=np.float64)
+        self.prev_outflow = current_outflow
+        self.output = current_outflow
+        return self.output
+
+    def get_state(self):
+        return {"output": self.output.tolist()}
@@ -0,0 +1,114 @@
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import numba
+import numpy as np
+
+from chs_sdk.utils.numba_threading import parallel_kernels_thread_safe
+from .semi_distributed import SemiDistributedHydrologyModel
+
+
+class HydrologyBatch:
+    """
+    Steps independent SemiDistributedHydrologyModel instances (separate basins
+    or the members of a calibration ensemble) concurrently on a thread pool.
+
+    Independent basins are parallelised across models rather than within one:
+    each pool thread runs the Numba kernels of its models on a single Numba
+    thread, and the models are bundled into at most `max_workers` tasks of at
+    least `min_task_basins` sub-basins each, balanced by sub-basin count, so
+    small models do not each pay the task submission overhead. The kernels
+    release the GIL, so the threads run in parallel. Launching the parallel
+    kernels from several threads at once needs Numba's 'tbb' or 'omp'
+    threading layer; under the 'workqueue' layer, which is not thread-safe,
+    the models are stepped one after another on the calling thread.
+
+    Use it as a context manager, or call `close()`, to shut the pool down.
+    """
+
+    def __init__(self, models: List[SemiDistributedHydrologyModel], max_workers: Optional[int] = None,
+                 min_task_basins: int = 1000):
+        self.models = list(models)
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        # Longest-processing-time bundling: each model, largest first, goes to
+        # the task with the fewest sub-basins so far.
+        total_basins = sum(model.num_basins for model in self.models)
+        num_tasks = max(1, min(len(self.models), self.max_workers, math.ceil(total_basins / min_task_basins)))
+        tasks = [[] for _ in range(num_tasks)]
+        loads = [0] * num_tasks
+        for index in sorted(range(len(self.models)), key=lambda i: -self.models[i].num_basins):
+            lightest = loads.index(min(loads))
+            tasks[lightest].append(index)
+            loads[lightest] += self.models[index].num_basins
+        self._tasks = [task for task in tasks if task]
+
+        self._executor = None
+        if len(self._tasks) > 1 and parallel_kernels_thread_safe():
+            self._executor = ThreadPoolExecutor(max_workers=len(self._tasks))
+
+    def _step_task(self, indices, dt, t, precipitation, outputs):
+        # Thread-local: the parallelism comes from the pool, not from within a model.
+        numba.set_num_threads(1)
+        for i in indices:
+            outputs[i] = self.models[i].step(dt=dt, t=t, precipitation=precipitation[i])
+
+    def step(self, dt: float, t: float, precipitation=0.0) -> np.ndarray:
+        """
+        Advances every model by one time step.
+
+        Args:
+            dt (float): Time step (hours).
+            t (float): Current simulation time.
+            precipitation (float or array-like): Uniform precipitation rate
+                (mm/hr) of each model, or one rate for all of them. Models
+                with `input_rainfall` read their own rainfall instead.
+
+        Returns:
+            np.ndarray: The total outflow (m^3/s) of each model, in model order.
+        """
+        precipitation = np.broadcast_to(np.asarray(precipitation, dtype=np.float64), (len(self.models),))
+        outputs = np.empty(len(self.models))
+        if self._executor is None:
+            # A single task runs on the calling thread with its usual Numba threads.
+            for i, model in enumerate(self.models):
+                outputs[i] = model.step(dt=dt, t=t, precipitation=precipitation[i])
+        else:
+            futures = [self._executor.submit(self._step_task, task, dt, t, precipitation, outputs)
+                       for task in self._tasks]
+            for future in futures:
+                future.result()
+        return outputs
+
+    def run(self, precipitation_series, dt: float, t0: float = 0.0) -> np.ndarray:
+        """
+        Runs every model through a precipitation series.
+
+        Args:
+            precipitation_series (array-like): Precipitation rates (mm/hr), of
+                shape (n_steps,) for all models or (n_steps, n_models).
+            dt (float): Time step (hours).
+            t0 (float): Time of the first step.
+
+        Returns:
+            np.ndarray: Total outflows (m^3/s) of shape (n_steps, n_models).
+        """
+        precipitation_series = np.asarray(precipitation_series, dtype=np.float64)
+        outflows = np.empty((len(precipitation_series), len(self.models)))
+        for k, precipitation in enumerate(precipitation_series):
+            outflows[k] = self.step(dt, t0 + k * dt, precipitation)
+        return outflows
+
+    def close(self):
+        """Shuts down the thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
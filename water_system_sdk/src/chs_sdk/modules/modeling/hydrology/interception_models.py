@@ -1,3 +1,19 @@
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def _intercept_series_jitted(rainfall, capacity):
+    """Jitted `HumanActivityModel.intercept` over a whole rainfall series."""
+    n = rainfall.shape[0]
+    net_rainfall = np.empty(n)
+    for i in range(n):
+        intercepted = rainfall[i] if rainfall[i] < capacity else capacity
+        net_rainfall[i] = rainfall[i] - intercepted
+        capacity -= intercepted
+    return net_rainfall, capacity
+
+
 class HumanActivityModel:
     """A placeholder for the HumanActivityModel."""
     def __init__(self, params):
@@ -8,3 +24,44 @@ class HumanActivityModel:
         intercepted = min(rainfall, self.capacity)
         self.capacity -= intercepted
         return rainfall - intercepted
+
+    def intercept_series(self, rainfall):
+        """
+        Applies `intercept` to every value of a rainfall series in one jitted
+        loop, depleting the capacity in the same order.
+
+        Returns:
+            np.ndarray: The rainfall left after interception at each step.
+        """
+        rainfall = np.ascontiguousarray(rainfall, dtype=np.float64)
+        net_rainfall, self.capacity = _intercept_series_jitted(rainfall, float(self.capacity))
+        return net_rainfall
+
+
+class BatchHumanActivityModel:
+    """
+    `HumanActivityModel` interception for many sub-basins at once, with the
+    remaining capacity of every sub-basin held in one array.
+
+    Args:
+        initial_capacity: Initial interception capacity (mm) of each sub-basin.
+    """
+    def __init__(self, initial_capacity):
+        self.capacity = np.array(initial_capacity, dtype=np.float64, ndmin=1)
+
+    @classmethod
+    def from_params(cls, params_list):
+        """Creates the batch from one `HumanActivityModel` parameter dict per sub-basin."""
+        return cls([params.get("initial_interception_capacity_mm", 0.0) for params in params_list])
+
+    def intercept(self, rainfall):
+        """
+        Intercepts one time step of rainfall for every sub-basin.
+
+        Returns:
+            np.ndarray: The rainfall left after interception in each sub-basin.
+        """
+        rainfall = np.asarray(rainfall, dtype=np.float64)
+        intercepted = np.minimum(rainfall, self.capacity)
+        self.capacity -= intercepted
+        return rainfall - intercepted
@@ -1,38 +1,86 @@
 from typing import Dict, Any
 import numpy as np
-from numba import njit
+from numba import njit, prange
 from .strategies import BaseRoutingModel
 
-@njit
-def _muskingum_route_jitted(effective_rainfall_vector, I_prev, O_prev, params, dt):
-    """Jitted and vectorized Muskingum routing calculation."""
-    # Extract parameter vectors
-    K = params['K']
-    x = params['x']
-    area_km2 = params['area']
-
-    # Vectorized conversion from effective rainfall (mm) to inflow (m^3/s)
-    inflow_m3_per_s = (effective_rainfall_vector * area_km2 * 1000) / (dt * 3600)
-
-    I_t = inflow_m3_per_s
-
-    # Calculate coefficients dynamically
+def _muskingum_coefficients(K, x, dt):
+    """Muskingum routing coefficients C1, C2 and C3 for storage constant K and weight x."""
     denominator = 2 * K * (1 - x) + dt
+    if np.any(denominator == 0):
+        raise ValueError("Muskingum parameters and dt result in a zero denominator.")
     C1 = (dt - 2 * K * x) / denominator
     C2 = (dt + 2 * K * x) / denominator
     C3 = (2 * K * (1 - x) - dt) / denominator
+    return C1, C2, C3
 
-    # Vectorized Muskingum equation
-    O_t = C1 * I_t + C2 * I_prev + C3 * O_prev
-
-    # Ensure non-negative outflow
-    O_t = np.maximum(O_t, 0.0)
+# Explicit signatures: the routing kernels are compiled once at import and
+# loaded from the on-disk cache afterwards, instead of on the first call in
+# every process. Callers pass contiguous float64 arrays.
+@njit('void(float64[::1], float64[::1], float64[::1], float64[::1], float64[::1], float64[::1], float64[::1])',
+      nogil=True, cache=True, fastmath=True)
+def _muskingum_route_jitted(effective_rainfall_vector, I_prev, O_prev, C1, C2, C3, scale):
+    """
+    Jitted Muskingum routing step for every sub-basin, given precomputed
+    coefficients and the mm -> m^3/s inflow scale of each sub-basin.
+    Advances the I_prev and O_prev states in place.
+    """
+    for i in range(effective_rainfall_vector.shape[0]):
+        I_t = effective_rainfall_vector[i] * scale[i]
+        O_t = C1[i] * I_t + C2[i] * I_prev[i] + C3[i] * O_prev[i]
+        # Ensure non-negative outflow
+        if O_t < 0.0:
+            O_t = 0.0
+        I_prev[i] = I_t
+        O_prev[i] = O_t
 
-    # Return new states
-    I_new = I_t
-    O_new = O_t
+@njit('Tuple((float64[::1], float64))(float64[::1], float64, float64, float64, float64, float64, float64)',
+      cache=True, fastmath=True, boundscheck=False)
+def _muskingum_route_series(effective_rainfall_series, I_prev, O_prev, C1, C2, C3, scale):
+    """
+    Jitted Muskingum routing of a whole effective rainfall series for one
+    sub-basin, carrying the inflow and outflow states through the loop.
+    """
+    n = effective_rainfall_series.shape[0]
+    O = np.empty(n)
+    for t in range(n):
+        I_t = effective_rainfall_series[t] * scale
+        O_t = C1 * I_t + C2 * I_prev + C3 * O_prev
+        if O_t < 0.0:
+            O_t = 0.0
+        O[t] = O_t
+        I_prev = I_t
+        O_prev = O_t
+    return O, I_prev
 
-    return O_t, I_new, O_new
+@njit('Tuple((float64[:, ::1], float64[::1], float64[::1]))(float64[:, ::1], float64[::1], float64[::1], float64[::1], float64[::1], float64[::1], float64[::1])',
+      parallel=True, cache=True, fastmath=True, boundscheck=False)
+def _muskingum_route_batch_jitted(rain_2d, I_prev_vec, O_prev_vec, C1_vec, C2_vec, C3_vec, scale_vec):
+    """
+    Jitted Muskingum routing of the effective rainfall series of many
+    independent sub-basins (rows of `rain_2d`), in parallel over sub-basins.
+    """
+    n_basins, n_steps = rain_2d.shape
+    O = np.empty((n_basins, n_steps))
+    I_last = np.empty(n_basins)
+    O_last = np.empty(n_basins)
+    for r in prange(n_basins):
+        I_prev = I_prev_vec[r]
+        O_prev = O_prev_vec[r]
+        C1 = C1_vec[r]
+        C2 = C2_vec[r]
+        C3 = C3_vec[r]
+        scale = scale_vec[r]
+        for t in range(n_steps):
+            I_t = rain_2d[r, t] * scale
+            O_t = C1 * I_t + C2 * I_prev + C3 * O_prev
+            if O_t < 0.0:
+                O_t = 0.0
+            O[r, t] = O_t
+            I_prev = I_t
+            O_prev = O_t
+        I_last[r] = I_prev
+        O_last[r] = O_prev
+    return O, I_last, O_last
 
 class MuskingumModel(BaseRoutingModel):
     """
@@ -48,45 +96,90 @@ class MuskingumModel(BaseRoutingModel):
         if 'states' in kwargs:
             self.I_prev = kwargs['states'].get("initial_inflow", 0.0)
             self.O_prev = kwargs['states'].get("initial_outflow", 0.0)
+        # Per sub-basin (C1, C2, C3, inflow scale) of the vectorized path,
+        # cached for the parameter values and dt they were computed from.
+        self._coeffs = None
+        self._coeffs_key = None
+        # (C1, C2, C3, inflow scale) of the scalar path, cached the same way.
+        self._scalar_coeffs = None
+        self._scalar_coeffs_key = None
 
-    def route_flow_vectorized(self, effective_rainfall_vector, I_prev, O_prev, params, dt):
+    def _prepare_scalar(self, sub_basin_params: Dict[str, Any], dt: float):
+        """Returns the cached scalar routing coefficients for `sub_basin_params` and `dt`."""
+        key = (sub_basin_params.get("K", 24), sub_basin_params.get("x", 0.2), sub_basin_params.get("area"), dt)
+        if key != self._scalar_coeffs_key:
+            K, x, area_km2, _ = key
+            if area_km2 is None:
+                raise ValueError("Muskingum routing requires 'area' in sub_basin_params.")
+            C1, C2, C3 = _muskingum_coefficients(float(K), float(x), dt)
+            # Convert effective rainfall (mm) over the area (km^2) to inflow (m^3/s)
+            # Rainfall (mm) -> 0.001 m
+            # Area (km^2) -> 1,000,000 m^2
+            # Volume (m^3) = effective_rainfall * 0.001 * area_km2 * 1,000,000
+            #              = effective_rainfall * area_km2 * 1000
+            # Inflow (m^3/s) = Volume / (dt * 3600)
+            scale = float(area_km2 * 1000 / (dt * 3600))
+            self._scalar_coeffs = (C1, C2, C3, scale)
+            self._scalar_coeffs_key = key
+        return self._scalar_coeffs
+
+    def prepare_coefficients(self, params, dt):
+        """
+        Returns the vectorized routing coefficients (C1, C2, C3, inflow scale)
+        for the structured parameter array `params` and `dt`, as contiguous
+        float64 vectors cached for the parameter values and dt.
+        """
+        key = (params.tobytes(), dt)
+        if key != self._coeffs_key:
+            K = params['K'].astype(np.float64)
+            x = params['x'].astype(np.float64)
+            C1, C2, C3 = _muskingum_coefficients(K, x, dt)
+            # Effective rainfall (mm) over the area (km^2) to inflow (m^3/s)
+            scale = params['area'].astype(np.float64) * 1000 / (dt * 3600)
+            self._coeffs = (C1, C2, C3, scale)
+            self._coeffs_key = key
+        return self._coeffs
+
+    def route_flow_vectorized(self, effective_rainfall_vector, I_prev, O_prev, params, dt, inplace=False):
         """
         Wrapper for the jitted vectorized Muskingum calculation.
+
+        By default the new states and the outflow are new arrays and I_prev
+        and O_prev are left untouched. With `inplace=True` the new states are
+        written into I_prev and O_prev when they are contiguous float64 arrays
+        (otherwise into float64 copies) and the returned outflow is the O state
+        array itself, so feeding the returned states back in allocates nothing
+        per step.
+
+        Returns:
+            (outflow, I_new, O_new)
         """
-        return _muskingum_route_jitted(effective_rainfall_vector, I_prev, O_prev, params, dt)
+        C1, C2, C3, scale = self.prepare_coefficients(params, dt)
+        if inplace:
+            I_new = np.ascontiguousarray(I_prev, dtype=np.float64)
+            O_new = np.ascontiguousarray(O_prev, dtype=np.float64)
+        else:
+            I_new = np.array(I_prev, dtype=np.float64)
+            O_new = np.array(O_prev, dtype=np.float64)
+        _muskingum_route_jitted(
+            np.ascontiguousarray(effective_rainfall_vector, dtype=np.float64),
+            I_new, O_new, C1, C2, C3, scale
+        )
+        outflow = O_new if inplace else O_new.copy()
+        return outflow, I_new, O_new
 
     def route_flow(self, effective_rainfall: float, sub_basin_params: Dict[str, Any], dt: float) -> float:
         """
         Routes the inflow for one time step using Muskingum method.
         """
-        # Get parameters from sub_basin_params, with defaults
-        K = float(sub_basin_params.get("K", 24))
-        x = float(sub_basin_params.get("x", 0.2))
-        area_km2 = sub_basin_params.get("area")
-
-        if area_km2 is None:
-            raise ValueError("Muskingum routing requires 'area' in sub_basin_params.")
-
-        # Convert effective rainfall (mm) over the area (km^2) to inflow (m^3/s)
-        # Rainfall (mm) -> 0.001 m
-        # Area (km^2) -> 1,000,000 m^2
-        # Volume (m^3) = effective_rainfall * 0.001 * area_km2 * 1,000,000
-        #              = effective_rainfall * area_km2 * 1000
-        # Inflow (m^3/s) = Volume / (dt * 3600)
-        inflow_m3_per_s = (effective_rainfall * area_km2 * 1000) / (dt * 3600)
-
-        I_t = inflow_m3_per_s
-
-        # Calculate coefficients dynamically, as dt might change
-        denominator = 2 * K * (1 - x) + dt
-        C1 = (dt - 2 * K * x) / denominator
-        C2 = (dt + 2 * K * x) / denominator
-        C3 = (2 * K * (1 - x) - dt) / denominator
+        C1, C2, C3, scale = self._prepare_scalar(sub_basin_params, dt)
+        I_t = effective_rainfall * scale
 
         # Muskingum equation: O_t = C1*I_t + C2*I_{t-1} + C3*O_{t-1}
         O_t = C1 * I_t + C2 * self.I_prev + C3 * self.O_prev
 
-        self.output = max(0, O_t)
+        # Ensure non-negative outflow
+        self.output = O_t if O_t > 0.0 else 0.0
 
         # Update states for the next time step
         self.I_prev = I_t
@@ -94,6 +187,25 @@ class MuskingumModel(BaseRoutingModel):
 
         return self.output
 
+    def route_series(self, effective_rainfall_series, sub_basin_params: Dict[str, Any], dt: float) -> np.ndarray:
+        """
+        Routes a whole series of effective rainfall (mm per time step) in a
+        single jitted loop. Equivalent to calling `route_flow` for every step.
+
+        Returns:
+            np.ndarray: The outflow (m^3/s) of each time step.
+        """
+        C1, C2, C3, scale = self._prepare_scalar(sub_basin_params, dt)
+        series = np.ascontiguousarray(effective_rainfall_series, dtype=np.float64)
+        outflow, I_last = _muskingum_route_series(
+            series, float(self.I_prev), float(self.O_prev), C1, C2, C3, scale
+        )
+
+        if len(outflow):
+            self.I_prev = I_last
+            self.O_prev = self.output = outflow[-1]
+        return outflow
+
     def get_state(self):
         """Returns the model's current state."""
         return {
@@ -102,6 +214,64 @@ class MuskingumModel(BaseRoutingModel):
             "output": self.output
         }
 
+class MuskingumBatchRouter:
+    """
+    Routes the effective rainfall series of many independent sub-basins with
+    the Muskingum method in a single parallel jitted call.
+
+    Args:
+        params: Per sub-basin 'K', 'x' and 'area' (km^2), e.g. the structured
+            parameter array of SemiDistributedHydrologyModel.
+        dt (float): The time step duration in hours.
+        initial_inflow, initial_outflow: Optional per sub-basin initial states.
+    """
+    def __init__(self, params, dt: float, initial_inflow=None, initial_outflow=None):
+        K = np.asarray(params['K'], dtype=np.float64)
+        x = np.asarray(params['x'], dtype=np.float64)
+        area_km2 = np.asarray(params['area'], dtype=np.float64)
+        self.num_basins = len(K)
+        self.C1, self.C2, self.C3 = _muskingum_coefficients(K, x, dt)
+        self.scale = area_km2 * 1000 / (dt * 3600)
+
+        self.I_prev = np.zeros(self.num_basins)
+        self.O_prev = np.zeros(self.num_basins)
+        if initial_inflow is not None:
+            self.I_prev[:] = initial_inflow
+        if initial_outflow is not None:
+            self.O_prev[:] = initial_outflow
+
+    def route(self, effective_rainfall: np.ndarray) -> np.ndarray:
+        """
+        Routes an (n_sub_basins, n_steps) array of effective rainfall (mm per
+        time step) and advances the inflow/outflow states.
+
+        Returns:
+            np.ndarray: The (n_sub_basins, n_steps) outflows in m^3/s.
+        """
+        rain = np.ascontiguousarray(effective_rainfall, dtype=np.float64)
+        if rain.ndim != 2 or rain.shape[0] != self.num_basins:
+            raise ValueError(f"effective_rainfall must have shape ({self.num_basins}, n_steps).")
+        outflow, self.I_prev, self.O_prev = _muskingum_route_batch_jitted(
+            rain, self.I_prev, self.O_prev, self.C1, self.C2, self.C3, self.scale
+        )
+        return outflow
+
+    def step(self, effective_rainfall_vector: np.ndarray) -> np.ndarray:
+        """
+        Routes one time step of effective rainfall (mm) for every sub-basin,
+        advancing the states in place without temporary arrays. Equivalent to
+        one `MuskingumModel.route_flow` call per sub-basin.
+
+        Returns:
+            np.ndarray: The outflow (m^3/s) of every sub-basin. The array is
+            the outflow state itself and is overwritten by the next step.
+        """
+        rain = np.ascontiguousarray(effective_rainfall_vector, dtype=np.float64)
+        if rain.shape != (self.num_basins,):
+            raise ValueError(f"effective_rainfall_vector must have shape ({self.num_basins},).")
+        _muskingum_route_jitted(rain, self.I_prev, self.O_prev, self.C1, self.C2, self.C3, self.scale)
+        return self.O_prev
+
 # Placeholder for UnitHydrographRoutingModel
 class UnitHydrographRoutingModel(BaseRoutingModel):
     def __init__(self, **kwargs):
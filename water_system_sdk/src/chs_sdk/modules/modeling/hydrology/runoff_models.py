@@ -1,41 +1,114 @@
 import math
-from typing import Dict, Any
+from typing import Dict, Any, Union
 import numpy as np
-from numba import njit
+from numba import njit, prange
 from .strategies import BaseRunoffModel
 
-@njit
-def _xinanjiang_runoff_jitted(rainfall_vector, W_initial, WM, B, IM):
-    """Jitted and vectorized Xinanjiang runoff calculation."""
+try:
+    import cupy  # type: ignore
+except ImportError:
+    # CuPy is only required for the 'cupy' backend of XinanjiangModel.
+    cupy = None
+
+# No 'ninf'/'nnan'/'afn' fast-math flags: the clamped power bases below can
+# be exactly zero, which must give 0 rather than exp(-inf * y).
+_XAJ_FASTMATH = {'nsz', 'arcp', 'contract', 'reassoc'}
+
+# Explicit signatures, as for the routing kernels: the vectorized kernels are
+# compiled once at import and loaded from the on-disk cache afterwards, so
+# calibration workers do not each pay the JIT on their first call. Rainfall is
+# float32 or float64; the parameter vectors, W and the runoff buffer are
+# contiguous float32 arrays.
+_XAJ_SIGNATURES = [
+    f'void({t}[:], float32[::1], float32[::1], float32[::1], float32[::1], float32[::1])'
+    for t in ('float32', 'float64')
+]
+_XAJ_UNIFORM_B_SIGNATURES = [
+    f'void({t}[:], float32[::1], float32[::1], float64, float32[::1], float32[::1])'
+    for t in ('float32', 'float64')
+]
+
+
+@njit(inline='always', fastmath=_XAJ_FASTMATH)
+def _xinanjiang_basin(rain, W, WM, WMM, one_pB, inv_1pB):
+    """Runoff and new soil moisture of one sub-basin with rain > 0."""
+    # Ordinate A of the current moisture W on the capacity curve. A saturated
+    # basin (W >= WM) clamps to the top, A = WMM.
+    saturation = min(W / WM, 1.0)
+    A = WMM * (1 - (1 - saturation) ** inv_1pB)
+
+    # Runoff; when rain + A reaches WMM the clamped term is zero and this
+    # reduces to rain - (WM - W).
+    term = max(1 - (rain + A) / WMM, 0.0)
+    runoff = max(0, rain + W - WM + WM * term ** one_pB)
+    return runoff, max(0, min(W + rain - runoff, WM))
+
+
+@njit(_XAJ_SIGNATURES, parallel=True, nogil=True, cache=True, fastmath=_XAJ_FASTMATH, boundscheck=False)
+def _xinanjiang_runoff_jitted(rainfall_vector, W, WM, B, IM, runoff):
+    """
+    Jitted and vectorized Xinanjiang runoff calculation, in parallel over
+    sub-basins (the thread count follows NUMBA_NUM_THREADS). The soil
+    moisture W is updated in place and the runoff is written into `runoff`.
+    """
     num_basins = len(rainfall_vector)
-    runoff = np.zeros(num_basins, dtype=np.float32)
-    W = W_initial.copy() # Make a mutable copy of the state
 
     # Evaporation is not included in this simplified vectorized version yet
     # It would require another vector input
 
-    WMM = WM * (1 + B)
+    # Per sub-basin constants of the storage capacity curve
+    one_pB = 1 + B.astype(np.float64)
+    inv_1pB = 1 / one_pB
+    WMM = WM * one_pB
 
-    for i in range(num_basins):
+    for i in prange(num_basins):
+        runoff[i] = 0
+        # Dry sub-basins are skipped: this saves both power evaluations.
         if rainfall_vector[i] > 0:
-            # Calculate A based on current moisture W[i] and max capacity WM[i]
-            if W[i] >= WM[i]:
-                A = WMM[i]
-            else:
-                A = WMM[i] * (1 - math.pow(1 - W[i] / WM[i], 1 / (1 + B[i])))
+            runoff[i], W[i] = _xinanjiang_basin(
+                rainfall_vector[i], W[i], WM[i], WMM[i], one_pB[i], inv_1pB[i]
+            )
 
-            # Calculate runoff based on rainfall and A
-            if rainfall_vector[i] + A >= WMM[i]:
-                current_runoff = rainfall_vector[i] - (WM[i] - W[i])
-            else:
-                term = 1 - (rainfall_vector[i] + A) / WMM[i]
-                current_runoff = rainfall_vector[i] + W[i] - WM[i] + WM[i] * math.pow(term, 1 + B[i])
 
-            runoff[i] = max(0, current_runoff)
-            W[i] += rainfall_vector[i] - runoff[i]
-            W[i] = max(0, min(W[i], WM[i]))
+@njit(_XAJ_UNIFORM_B_SIGNATURES, parallel=True, nogil=True, cache=True, fastmath=_XAJ_FASTMATH, boundscheck=False)
+def _xinanjiang_runoff_uniform_b_jitted(rainfall_vector, W, WM, B, IM, runoff):
+    """
+    `_xinanjiang_runoff_jitted` for sub-basins that all share the same B
+    (a common calibration choice). The curve exponents are scalars, so no
+    per sub-basin constant arrays are built.
+    """
+    one_pB = 1 + np.float64(B)
+    inv_1pB = 1 / one_pB
 
-    return runoff, W
+    for i in prange(len(rainfall_vector)):
+        runoff[i] = 0
+        if rainfall_vector[i] > 0:
+            runoff[i], W[i] = _xinanjiang_basin(
+                rainfall_vector[i], W[i], WM[i], WM[i] * one_pB, one_pB, inv_1pB
+            )
+
+
+# The per-basin logic of `_xinanjiang_basin` as a CUDA elementwise kernel for
+# the 'cupy' backend; W is updated in place.
+_XAJ_CUPY_KERNEL = None if cupy is None else cupy.ElementwiseKernel(
+    'float32 rain, float32 WM, float32 B',
+    'float32 runoff, float32 W',
+    '''
+    double r = 0.0;
+    if (rain > 0) {
+        double w = W;
+        double one_pB = 1.0 + (double)B;
+        double WMM = WM * one_pB;
+        double saturation = fmin(w / WM, 1.0);
+        double A = WMM * (1.0 - pow(1.0 - saturation, 1.0 / one_pB));
+        double term = fmax(1.0 - (rain + A) / WMM, 0.0);
+        r = fmax(rain + w - WM + WM * pow(term, one_pB), 0.0);
+        W = fmax(fmin(w + rain - r, (double)WM), 0.0);
+    }
+    runoff = r;
+    ''',
+    'xinanjiang_runoff'
+)
 
 
 class RunoffCoefficientModel(BaseRunoffModel):
@@ -68,12 +141,57 @@ class RunoffCoefficientModel(BaseRunoffModel):
         dummy_state = np.zeros_like(rainfall_vector)
         return runoff_vector, dummy_state
 
+class XinanjiangParams:
+    """
+    Xinanjiang parameters of one sub-basin, parsed once from a parameter dict
+    so that `XinanjiangModel.calculate_runoff` skips the dict lookups.
+    """
+    __slots__ = ('WM', 'B', 'IM', 'evaporation')
+
+    def __init__(self, WM: float = 100.0, B: float = 0.3, IM: float = 0.05, evaporation: float = 0.0):
+        self.WM = WM
+        self.B = B
+        self.IM = IM
+        self.evaporation = evaporation
+
+    @classmethod
+    def from_dict(cls, params: Dict[str, Any]) -> "XinanjiangParams":
+        return cls(
+            WM=float(params.get("WM", 100)),
+            B=float(params.get("B", 0.3)),
+            IM=float(params.get("IM", 0.05)),
+            evaporation=float(params.get("evaporation", 0.0)),
+        )
+
 class XinanjiangModel(BaseRunoffModel):
     """
     Implementation of the Xinanjiang rainfall-runoff model.
     Includes both original and vectorized methods.
+
+    With `backend='cupy'` (requires CuPy and a CUDA device) the vectorized
+    path runs as an elementwise GPU kernel and the soil moisture state stays
+    in GPU memory, which pays off for very many sub-basins. The default
+    'numpy' backend runs the parallel Numba kernels on the CPU.
     """
-    def __init__(self, **kwargs):
+    def __init__(self, backend: str = 'numpy', **kwargs):
+        if backend not in ('numpy', 'cupy'):
+            raise ValueError(f"Unknown backend '{backend}'. Expected 'numpy' or 'cupy'.")
+        if backend == 'cupy' and cupy is None:
+            raise ImportError("The 'cupy' backend requires CuPy to be installed.")
+        self.backend = backend
+        # Contiguous (WM, B, IM, uniform B) of the vectorized path, cached for
+        # the parameter values they were made from; the fields of the
+        # structured parameter array are strided views.
+        self._param_arrays = None
+        self._param_arrays_key = None
+        # Device copies of WM and B for the 'cupy' backend, and the host
+        # arrays they were made from.
+        self._device_params = None
+        self._device_params_source = None
+        # XinanjiangParams of the scalar path, cached for the dict values they
+        # were parsed from so a changed parameter dict is parsed again.
+        self._scalar_params = None
+        self._scalar_params_key = None
         # This model is now effectively stateless for the vectorized path.
         # The state is managed by the orchestrator (e.g., SemiDistributedHydrologyModel)
         self.params = kwargs
@@ -84,40 +202,116 @@ class XinanjiangModel(BaseRunoffModel):
             WM = self.params.get('WM', 100)
             self.W = kwargs['states'].get("initial_W", WM * 0.5)
 
-    def calculate_runoff_vectorized(self, rainfall_vector, W_initial, params, dt):
+    def calculate_runoff_vectorized(self, rainfall_vector, W_initial, params, dt, runoff_out=None,
+                                    inplace=False):
         """
         Wrapper for the jitted vectorized Xinanjiang calculation.
 
+        By default the new soil moisture is a new array and W_initial is left
+        untouched. With `inplace=True` it is written into W_initial when that
+        is a contiguous float32 array (otherwise into a float32 copy), so
+        feeding the returned state back in allocates nothing per step.
+
         Args:
             rainfall_vector (np.ndarray): Vector of rainfall for each sub-basin.
             W_initial (np.ndarray): The initial soil moisture state vector.
             params (np.ndarray): The structured array of parameters for all sub-basins.
             dt (float): Time step.
+            runoff_out (np.ndarray, optional): Preallocated float32 buffer the
+                runoff is written into. A new array is allocated if omitted.
+                On the 'cupy' backend a host buffer receives a copy of the
+                runoff; otherwise the runoff is returned as a device array.
+            inplace (bool): Whether to advance W_initial in place.
 
         Returns:
             Tuple[np.ndarray, np.ndarray]: A tuple containing the runoff vector and the updated state vector.
+            On the 'cupy' backend the state vector is a device array.
         """
-        # Extract parameter vectors from the structured array
-        WM = params['WM']
-        B = params['B']
-        IM = params['IM']
+        if self.backend == 'cupy':
+            return self._calculate_runoff_cupy(rainfall_vector, W_initial, params, runoff_out, inplace)
 
-        runoff, W_new = _xinanjiang_runoff_jitted(rainfall_vector, W_initial, WM, B, IM)
-        return runoff, W_new
+        WM, B, IM, uniform_B = self.prepare_params(params)
 
-    def calculate_runoff(self, rainfall: float, sub_basin_params: Dict[str, Any], dt: float) -> float:
+        # Match the compiled signatures; float32 and float64 rainfall pass as is.
+        rainfall_vector = np.asarray(rainfall_vector)
+        if rainfall_vector.dtype != np.float32:
+            rainfall_vector = rainfall_vector.astype(np.float64, copy=False)
+        if inplace:
+            W = np.ascontiguousarray(W_initial, dtype=np.float32)
+        else:
+            W = np.array(W_initial, dtype=np.float32)
+        if runoff_out is None:
+            runoff_out = np.empty(len(rainfall_vector), dtype=np.float32)
+        if uniform_B:
+            _xinanjiang_runoff_uniform_b_jitted(rainfall_vector, W, WM, B[0], IM, runoff_out)
+        else:
+            _xinanjiang_runoff_jitted(rainfall_vector, W, WM, B, IM, runoff_out)
+        return runoff_out, W
+
+    def prepare_params(self, params):
+        """
+        Returns the WM, B and IM vectors of the structured parameter array
+        `params` as contiguous float32 arrays, and whether B is uniform,
+        cached for the parameter values.
+        """
+        key = params.tobytes()
+        if key != self._param_arrays_key:
+            WM, B, IM = (np.ascontiguousarray(params[name], dtype=np.float32) for name in ('WM', 'B', 'IM'))
+            uniform_B = bool(len(B)) and bool((B == B[0]).all())
+            self._param_arrays = (WM, B, IM, uniform_B)
+            self._param_arrays_key = key
+        return self._param_arrays
+
+    def _calculate_runoff_cupy(self, rainfall_vector, W_initial, params, runoff_out, inplace):
+        """`calculate_runoff_vectorized` on the GPU."""
+        host_params = self.prepare_params(params)
+        if host_params is not self._device_params_source:
+            self._device_params = (cupy.asarray(host_params[0]), cupy.asarray(host_params[1]))
+            self._device_params_source = host_params
+        WM, B = self._device_params
+
+        rain = cupy.asarray(rainfall_vector, dtype=np.float32)
+        if inplace:
+            W = cupy.ascontiguousarray(cupy.asarray(W_initial, dtype=np.float32))
+        else:
+            W = cupy.array(W_initial, dtype=np.float32)
+        if isinstance(runoff_out, cupy.ndarray):
+            _XAJ_CUPY_KERNEL(rain, WM, B, runoff_out, W)
+            return runoff_out, W
+        runoff = cupy.empty(rain.shape, dtype=np.float32)
+        _XAJ_CUPY_KERNEL(rain, WM, B, runoff, W)
+        if runoff_out is None:
+            return runoff, W
+        runoff.get(out=runoff_out)
+        return runoff_out, W
+
+    def calculate_runoff(self, rainfall: float, sub_basin_params: Union[Dict[str, Any], XinanjiangParams], dt: float) -> float:
         """
         Calculates runoff based on Xinanjiang model logic.
         Assumes 'evaporation' is provided in sub_basin_params if needed.
+        `sub_basin_params` may also be a pre-parsed XinanjiangParams.
         """
-        # Update parameters dynamically if they are provided
-        WM = float(sub_basin_params.get("WM", 100))
-        B = float(sub_basin_params.get("B", 0.3))
-        IM = float(sub_basin_params.get("IM", 0.05))
+        if not isinstance(sub_basin_params, XinanjiangParams):
+            sub_basin_params = self._parse_params(sub_basin_params)
+        return self.calculate_runoff_fast(rainfall, sub_basin_params, dt)
+
+    def _parse_params(self, sub_basin_params: Dict[str, Any]) -> XinanjiangParams:
+        """Returns the cached XinanjiangParams of `sub_basin_params`."""
+        key = (sub_basin_params.get("WM"), sub_basin_params.get("B"),
+               sub_basin_params.get("IM"), sub_basin_params.get("evaporation"))
+        if key != self._scalar_params_key:
+            self._scalar_params = XinanjiangParams.from_dict(sub_basin_params)
+            self._scalar_params_key = key
+        return self._scalar_params
+
+    def calculate_runoff_fast(self, rainfall: float, params: XinanjiangParams, dt: float) -> float:
+        """`calculate_runoff` with the parameters already parsed."""
+        WM = params.WM
+        B = params.B
 
         # Evaporation is not part of the new interface, so we need to handle it.
         # Let's assume evaporation is zero if not provided.
-        evaporation = float(sub_basin_params.get("evaporation", 0.0)) * dt
+        evaporation = params.evaporation * dt
 
         # Evaporation is subtracted from soil moisture first.
         actual_evaporation = evaporation * (self.W / WM)
@@ -138,9 +332,11 @@ class XinanjiangModel(BaseRunoffModel):
                 runoff = rainfall + self.W - WM + WM * math.pow(1 - (rainfall + A) / WMM, 1 + B)
 
             runoff = max(0, runoff)
-            self.W += rainfall - runoff
-
-        self.W = max(0, min(self.W, WM))
+            self.W = max(0, min(self.W + (rainfall - runoff), WM))
+        elif not 0 <= self.W <= WM:
+            # Dry steps leave W in range unless evaporation exceeded WM or
+            # WM changed since the last call, so the clamp is rarely needed.
+            self.W = max(0, min(self.W, WM))
         self.output = runoff
         return self.output
 
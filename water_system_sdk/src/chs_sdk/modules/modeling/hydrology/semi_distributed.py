@@ -1,12 +1,75 @@
+import inspect
 import pandas as pd
 from typing import List, Union
+from numba import njit, prange, types
 from chs_sdk.modules.modeling.base_model import BaseModel
 from chs_sdk.modules.modeling.hydrology.sub_basin import SubBasin
 from .strategies import BaseRunoffModel, BaseRoutingModel
+from .runoff_models import XinanjiangModel, _XAJ_FASTMATH, _xinanjiang_basin
+from .routing_models import MuskingumModel
 
 
 import numpy as np
 
+
+def _aligned_empty(shape, dtype, align=64):
+    """Uninitialised array whose data starts on an `align`-byte boundary (a cache line)."""
+    n = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    buf = np.empty(n + align, dtype=np.uint8)
+    offset = -buf.ctypes.data % align
+    return buf[offset:offset + n].view(dtype).reshape(shape)
+
+
+# Compiled at import like the runoff and routing kernels. The rates are either
+# the float32 rainfall buffer or a read-only zero-stride float64 broadcast view.
+_FUSED_STEP_SIGNATURES = [
+    types.float64(rate, types.float64, types.float32[::1], types.float32[::1], types.float32[::1],
+                  types.float64[::1], types.float64[::1], types.float64[::1], types.float64[::1],
+                  types.float64[::1], types.float64[::1])
+    for rate in (types.float32[::1], types.Array(types.float64, 1, 'A', readonly=True))
+]
+
+
+@njit(_FUSED_STEP_SIGNATURES, parallel=True, nogil=True, cache=True, fastmath=_XAJ_FASTMATH, boundscheck=False)
+def _xinanjiang_muskingum_step(rainfall_rate, dt, W, WM, B, I_prev, O_prev, C1, C2, C3, scale):
+    """
+    Fused Xinanjiang runoff and Muskingum routing step for every sub-basin,
+    so the effective rainfall never goes through an intermediate array.
+    `rainfall_rate` is in mm/hr and may be a zero-stride broadcast view.
+    Advances W, I_prev and O_prev in place and returns the total outflow.
+    """
+    total = 0.0
+    for i in prange(len(rainfall_rate)):
+        runoff = np.float32(0.0)
+        # Rainfall depth rounded like the float32 rainfall vector of the unfused path
+        rain = np.float32(rainfall_rate[i] * dt)
+        if rain > 0:
+            one_pB = 1 + np.float64(B[i])
+            r, W[i] = _xinanjiang_basin(
+                rain, W[i], WM[i], WM[i] * one_pB, one_pB, 1 / one_pB
+            )
+            # Rounded like the float32 runoff vector of the unfused path
+            runoff = np.float32(r)
+        I_t = runoff * scale[i]
+        O_t = C1[i] * I_t + C2[i] * I_prev[i] + C3[i] * O_prev[i]
+        if O_t < 0.0:
+            O_t = 0.0
+        I_prev[i] = I_t
+        O_prev[i] = O_t
+        total += O_t
+    return total
+
+def _accepts_keyword(func, name):
+    """Whether `func` can be called with the keyword argument `name`."""
+    if func is None:
+        return False
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == name or p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters)
+
+
 class SemiDistributedHydrologyModel(BaseModel):
     """
     A semi-distributed hydrological model that uses strategy pattern to simulate
@@ -19,10 +82,15 @@ class SemiDistributedHydrologyModel(BaseModel):
         sub_basins: List[dict],
         runoff_strategy: BaseRunoffModel,
         routing_strategy: BaseRoutingModel,
+        fused: bool = True,
         **kwargs
     ):
         """
         Initializes the SemiDistributedHydrologyModel.
+
+        With `fused=True` the default XinanjiangModel + MuskingumModel pair
+        (exactly those classes, not subclasses) runs as one fused kernel
+        instead of through the strategies' vectorized methods.
         """
         super().__init__(**kwargs)
         self.runoff_strategy = runoff_strategy
@@ -32,6 +100,8 @@ class SemiDistributedHydrologyModel(BaseModel):
 
         # Create and store SubBasin objects so other components can inspect them
         self.sub_basins = [SubBasin(**sb_data) for sb_data in sub_basins]
+        # Rainfall column of each sub-basin, in parameter array order
+        self._sub_basin_ids = [sb.id for sb in self.sub_basins]
 
         # --- Vectorization Setup ---
         num_basins = len(sub_basins)
@@ -45,9 +115,32 @@ class SemiDistributedHydrologyModel(BaseModel):
         self.params = np.zeros(num_basins, dtype=param_dtype)
 
         # Initialize parameter and state arrays
-        self.runoff_state_W = np.zeros(num_basins, dtype=np.float32)
+        # The runoff side runs in float32 throughout; its per-step arrays are
+        # cache-line aligned for the vectorized kernels.
+        self.runoff_state_W = _aligned_empty(num_basins, np.float32)
+        self.runoff_state_W.fill(0.0)
         self.routing_state_I_prev = np.zeros(num_basins, dtype=np.float32)
         self.routing_state_O_prev = np.zeros(num_basins, dtype=np.float32)
+        # The default Xinanjiang + Muskingum pair runs as one fused CPU kernel.
+        # Subclasses may override the vectorized methods, so they are not fused.
+        self._fused = (fused and type(runoff_strategy) is XinanjiangModel and runoff_strategy.backend == 'numpy'
+                       and type(routing_strategy) is MuskingumModel)
+        # Vectorized strategy methods, bound once instead of looked up every
+        # step; None for a strategy without a vectorized path.
+        self._runoff_vectorized = getattr(runoff_strategy, 'calculate_runoff_vectorized', None)
+        self._route_vectorized = getattr(routing_strategy, 'route_flow_vectorized', None)
+        # Scratch buffer the vectorized runoff strategy writes into every step,
+        # for strategies whose vectorized method takes a `runoff_out` array.
+        self._runoff_buf = _aligned_empty(num_basins, np.float32)
+        self._runoff_kwargs = (
+            {'runoff_out': self._runoff_buf} if _accepts_keyword(self._runoff_vectorized, 'runoff_out') else {}
+        )
+        # The model owns its runoff and routing states, so strategies that can
+        # advance them in place are asked to.
+        if _accepts_keyword(self._runoff_vectorized, 'inplace'):
+            self._runoff_kwargs['inplace'] = True
+        self._route_kwargs = {'inplace': True} if _accepts_keyword(self._route_vectorized, 'inplace') else {}
+        self._precip_buf = _aligned_empty(num_basins, np.float32)
 
         for i, sb_info in enumerate(sub_basins):
             p = sb_info['params']
@@ -65,44 +158,68 @@ class SemiDistributedHydrologyModel(BaseModel):
         """
         Executes a single time step for the entire watershed model using vectorized operations.
         """
-        precip_vector = np.zeros(self.num_basins, dtype=np.float32)
+        # Precipitation rates (mm/hr) of every sub-basin
+        precip_rate = None
         if self.input_rainfall is not None and not self.input_rainfall.empty:
             # Find the row corresponding to the current time t
             # We use a tolerance to handle potential floating point inaccuracies
             time_slice = self.input_rainfall[np.isclose(self.input_rainfall.index.values, t)]
             if not time_slice.empty:
                 # Get the rainfall for each sub-basin by its ID
-                sub_basin_ids = [sb.id for sb in self.sub_basins]
+                sub_basin_ids = self._sub_basin_ids
                 # Ensure all sub-basin IDs are present in the dataframe columns
                 if all(sid in time_slice.columns for sid in sub_basin_ids):
-                    precip_values = time_slice[sub_basin_ids].iloc[0].values
-                    # The input is assumed to be in mm/hr, convert to mm for the time step
-                    precip_vector = precip_values * dt
+                    precip_rate = self._precip_buf
+                    np.copyto(precip_rate, time_slice[sub_basin_ids].iloc[0].values, casting='unsafe')
                 else:
                     # Fallback or error if a sub-basin's data is missing
                     pass # Defaulting to zeros
         else:
-            # Fallback to uniform precipitation if no spatial data is provided
+            # Fallback to uniform precipitation if no spatial data is provided;
+            # broadcasting the scalar is a zero-copy view.
             uniform_precip_per_hour = kwargs.get('precipitation', 0.0)
-            uniform_precip_mm = uniform_precip_per_hour * dt
-            precip_vector = np.full(self.num_basins, uniform_precip_mm, dtype=np.float32)
+            precip_rate = np.broadcast_to(np.float64(uniform_precip_per_hour), (self.num_basins,))
+        if precip_rate is None:
+            precip_rate = np.broadcast_to(np.float64(0.0), (self.num_basins,))
+
+        if self._fused:
+            WM, B, _, _ = self.runoff_strategy.prepare_params(self.params)
+            C1, C2, C3, scale = self.routing_strategy.prepare_coefficients(self.params, dt)
+            # The routing states are float64 arrays, as route_flow_vectorized returns them
+            self.routing_state_I_prev = np.ascontiguousarray(self.routing_state_I_prev, dtype=np.float64)
+            self.routing_state_O_prev = np.ascontiguousarray(self.routing_state_O_prev, dtype=np.float64)
+            # The kernel converts the rates to mm for the time step itself.
+            self.output = _xinanjiang_muskingum_step(
+                precip_rate, dt, self.runoff_state_W, WM, B,
+                self.routing_state_I_prev, self.routing_state_O_prev, C1, C2, C3, scale
+            )
+            return self.output
+
+        # The input is assumed to be in mm/hr, convert to mm for the time step
+        precip_vector = self._precip_buf
+        np.multiply(precip_rate, dt, out=precip_vector, casting='unsafe')
 
+        # A strategy without a vectorized path fails here with its AttributeError.
+        runoff_vectorized = self._runoff_vectorized or self.runoff_strategy.calculate_runoff_vectorized
+        route_vectorized = self._route_vectorized or self.routing_strategy.route_flow_vectorized
 
         # 1. Call the (vectorized) runoff strategy
-        effective_rainfall_mm, self.runoff_state_W = self.runoff_strategy.calculate_runoff_vectorized(
+        effective_rainfall_mm, self.runoff_state_W = runoff_vectorized(
             rainfall_vector=precip_vector,
             W_initial=self.runoff_state_W,
             params=self.params,
-            dt=dt
+            dt=dt,
+            **self._runoff_kwargs
         )
 
         # 2. Call the (vectorized) routing strategy
-        outflow_vector, self.routing_state_I_prev, self.routing_state_O_prev = self.routing_strategy.route_flow_vectorized(
+        outflow_vector, self.routing_state_I_prev, self.routing_state_O_prev = route_vectorized(
             effective_rainfall_vector=effective_rainfall_mm,
             I_prev=self.routing_state_I_prev,
             O_prev=self.routing_state_O_prev,
             params=self.params,
-            dt=dt
+            dt=dt,
+            **self._route_kwargs
         )
 
         # 3. Sum the outflows from all sub-basins
@@ -33,17 +33,36 @@ class Pipeline(BaseDataProcessor):
                                from BaseDataProcessor.
         """
         self.processors = processors
+        # Bound process methods, resolved once, with consecutive unit
+        # conversions of the same columns merged into a single scaling.
+        self._steps = tuple(processor.process for processor in _merge_unit_converters(processors))
 
     def process(self, data_input: pd.DataFrame) -> pd.DataFrame:
         """
         Processes the data by passing it through each processor in the pipeline.
         """
         data = data_input
-        for processor in self.processors:
-            data = processor.process(data)
+        for step in self._steps:
+            data = step(data)
         return data
 
 
+def _merge_unit_converters(processors: list) -> list:
+    """
+    Replaces each run of UnitConverters on the same columns with one converter
+    scaling by the product of their factors, so the data is copied once.
+    """
+    merged = []
+    for processor in processors:
+        previous = merged[-1] if merged else None
+        if (type(processor) is UnitConverter and type(previous) is UnitConverter
+                and previous.columns == processor.columns):
+            merged[-1] = UnitConverter(previous.scale_factor * processor.scale_factor, processor.columns)
+        else:
+            merged.append(processor)
+    return merged
+
+
 class DataCleaner(BaseDataProcessor):
     """
     A data processor to clean data, e.g., by filling missing values.
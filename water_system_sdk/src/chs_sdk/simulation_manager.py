@@ -348,13 +348,21 @@ class SimulationManager:
                     params["pipeline"] = self._create_pipeline(pipeline_config)
                 self.components[name] = component_class(**params)
 
-    def _execute_step(self, instruction: Any, t: float, dt: float, simulation_mode: SimulationMode):
-        """Executes a single instruction from the execution_order."""
+    def _execute_step(self, instruction: Any, t: float, dt: float, simulation_mode: SimulationMode,
+                      entity_class: Optional[type] = None):
+        """
+        Executes a single instruction from the execution_order.
+
+        `entity_class` is the BasePhysicalEntity class; the run loop resolves it
+        once and passes it in, so it is not re-imported on every step.
+        """
+        if entity_class is None:
+            entity_class = ComponentRegistry.get_class("BasePhysicalEntity")
         if isinstance(instruction, str):
             # It's a simple component name, call the standard step method
             component = self.components[instruction]
             # Pass simulation_mode to entities, otherwise call standard step
-            if isinstance(component, ComponentRegistry.get_class("BasePhysicalEntity")):
+            if isinstance(component, entity_class):
                  component.step(simulation_mode=simulation_mode, dt=dt, t=t)
             else:
                  component.step(dt=dt, t=t)
@@ -373,7 +381,7 @@ class SimulationManager:
             # Prepare arguments for the method call
             args = {}
             # Add simulation_mode to args if the method is 'step' and the component is an entity
-            if method_name == 'step' and isinstance(component, ComponentRegistry.get_class("BasePhysicalEntity")):
+            if method_name == 'step' and isinstance(component, entity_class):
                 args['simulation_mode'] = simulation_mode
 
             for arg_name, source_path in instruction.get("args", {}).items():
@@ -571,6 +579,7 @@ class SimulationManager:
             raise ValueError("'execution_order' cannot be empty.")
 
         history = []
+        entity_class = ComponentRegistry.get_class("BasePhysicalEntity")
 
         # For STEADY mode, we only run one step (t=0)
         if simulation_mode == SimulationMode.STEADY:
@@ -591,7 +600,8 @@ class SimulationManager:
 
             # 3. Execute components based on the new expressive execution order
             for instruction in execution_order:
-                self._execute_step(instruction, t=t, dt=dt, simulation_mode=simulation_mode)
+                self._execute_step(instruction, t=t, dt=dt, simulation_mode=simulation_mode,
+                                   entity_class=entity_class)
 
             # 4. Log data for this time step
             step_log = {"time": t}
@@ -0,0 +1,28 @@
+import numba
+import numpy as np
+from numba import njit, prange
+
+# Numba threading layers that allow parallel kernels to be launched from
+# several Python threads at once. The 'workqueue' fallback aborts the process.
+THREAD_SAFE_LAYERS = ('tbb', 'omp')
+
+
+@njit(parallel=True, cache=True)
+def _touch_threading_layer(x):
+    for i in prange(x.shape[0]):
+        x[i] = 0.0
+
+
+def numba_threading_layer() -> str:
+    """Name of the Numba threading layer in use, launching it if no parallel kernel has run yet."""
+    try:
+        return numba.threading_layer()
+    except ValueError:
+        # The layer is only chosen when the first parallel kernel runs.
+        _touch_threading_layer(np.empty(1))
+        return numba.threading_layer()
+
+
+def parallel_kernels_thread_safe() -> bool:
+    """Whether parallel Numba kernels may be called concurrently from several threads."""
+    return numba_threading_layer() in THREAD_SAFE_LAYERS
@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+
+from chs_sdk.modules.hydro_distributed.gistools import GISTools
+
+
+NO_DATA = -9999.0
+
+# A bowl draining through a gap in its bottom edge, with a pit at (2, 2), a
+# flat shelf of 7s and a no-data cell at (3, 3).
+DEM = np.array([
+    [9.0, 9.0, 9.0, 9.0, 9.0, 9.0],
+    [9.0, 8.0, 7.0, 7.0, 7.0, 9.0],
+    [9.0, 8.0, 3.0, 7.0, 7.0, 9.0],
+    [9.0, 8.0, 6.0, NO_DATA, 7.0, 9.0],
+    [9.0, 7.0, 6.0, 5.0, 4.0, 9.0],
+    [9.0, 9.0, 9.0, 9.0, 2.0, 9.0],
+])
+
+
+class TestGISTools(unittest.TestCase):
+
+    def test_fill_sinks_raises_pit_to_its_spill_level(self):
+        filled = GISTools.fill_sinks(DEM, NO_DATA)
+        expected = DEM.copy()
+        expected[2, 2] = 6.0
+        np.testing.assert_array_equal(filled, expected)
+
+    def test_flow_direction_and_accumulation(self):
+        fdr = GISTools.flow_direction(GISTools.fill_sinks(DEM, NO_DATA), NO_DATA)
+        # Flats, the filled pit and the no-data cell have no direction.
+        np.testing.assert_array_equal(fdr, [
+            [2, 2, 4, 4, 4, 8],
+            [1, 2, 4, 8, 0, 16],
+            [1, 1, 0, 16, 0, 16],
+            [2, 1, 2, 0, 4, 8],
+            [1, 1, 1, 2, 4, 16],
+            [128, 128, 64, 1, 0, 16],
+        ])
+        np.testing.assert_array_equal(GISTools.flow_accumulation(fdr), [
+            [1, 1, 1, 1, 1, 1],
+            [1, 3, 3, 2, 4, 1],
+            [1, 2, 12, 1, 2, 1],
+            [1, 1, 2, 1, 1, 1],
+            [1, 4, 7, 10, 4, 1],
+            [1, 1, 1, 1, 17, 1],
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
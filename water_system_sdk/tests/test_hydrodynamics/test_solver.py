@@ -0,0 +1,118 @@
+import unittest
+
+from chs_sdk.modules.hydrodynamics.network import HydrodynamicNetwork
+from chs_sdk.modules.hydrodynamics.node import InflowBoundary, JunctionNode, LevelBoundary
+from chs_sdk.modules.hydrodynamics.reach import Reach
+from chs_sdk.modules.hydrodynamics.structures import WeirStructure
+from chs_sdk.modules.hydrodynamics.solver import Solver
+
+
+def build_channel_with_weir(num_nodes=8, inflow=20.0):
+    """
+    Builds a branched channel: (Inflow) -> J1 ... Jn -> Weir -> WD -> (Level),
+    with a lateral inflow joining at J2.
+    """
+    network = HydrodynamicNetwork()
+    nodes = [InflowBoundary("In", inflow=inflow, head=10.0, bed_elevation=5.0)]
+    nodes += [JunctionNode(f"J{i}", head=10.0 - 0.01 * i, bed_elevation=5.0 - 0.01 * i)
+              for i in range(1, num_nodes)]
+    for i in range(num_nodes - 1):
+        network.add_reach(Reach(f"R{i}", nodes[i], nodes[i + 1], length=500,
+                                discharge=inflow, side_slope=0.5 * (i % 3)))
+
+    side = InflowBoundary("Side", inflow=5.0, head=10.1, bed_elevation=5.2)
+    network.add_reach(Reach("RSide", side, nodes[2], length=300, discharge=5.0, bottom_width=4.0))
+
+    weir_down = JunctionNode("WD", head=9.0, bed_elevation=4.0)
+    network.add_structure(WeirStructure("Weir", nodes[-1], weir_down, crest_elevation=9.5,
+                                        crest_width=20.0, discharge=inflow + 5.0))
+    outlet = LevelBoundary("Out", level=8.9, head=8.9, bed_elevation=3.9)
+    network.add_reach(Reach("ROut", weir_down, outlet, length=300, discharge=inflow + 5.0, bottom_width=20))
+    return network
+
+
+class TestHydrodynamicSolver(unittest.TestCase):
+
+    def test_branched_network_converges_to_steady_flow(self):
+        """
+        Runs the St. Venant solver on a branched network with a weir until it
+        reaches steady state, and checks that the flows balance the inflows.
+        """
+        network = build_channel_with_weir()
+        solver = Solver(network, max_iterations=50)
+
+        for _ in range(200):
+            self.assertTrue(solver.solve_step(dt=300.0))
+
+        total_inflow = 25.0
+        self.assertAlmostEqual(network.get_reach("R0").discharge, 20.0, places=2)
+        self.assertAlmostEqual(network.get_reach("RSide").discharge, 5.0, places=2)
+        self.assertAlmostEqual(network.get_structure("Weir").discharge, total_inflow, places=2)
+        self.assertAlmostEqual(network.get_reach("ROut").discharge, total_inflow, places=2)
+
+        # Water must be above the weir crest to pass the inflow.
+        self.assertGreater(network.get_node("J7").head, 9.5)
+
+    def test_preconditioned_iterative_solver_matches_direct(self):
+        """
+        The BiCGSTAB linear solver (preconditioned with a reused LU
+        factorization) should give the same transient as the direct solver.
+        """
+        direct_network = build_channel_with_weir()
+        iterative_network = build_channel_with_weir()
+        direct = Solver(direct_network, max_iterations=50)
+        iterative = Solver(iterative_network, max_iterations=50, linear_solver='bicgstab')
+
+        for _ in range(10):
+            self.assertTrue(direct.solve_step(dt=60.0))
+            self.assertTrue(iterative.solve_step(dt=60.0))
+
+        for node_d, node_i in zip(direct_network.nodes, iterative_network.nodes):
+            self.assertAlmostEqual(node_d.head, node_i.head, places=4)
+        for reach_d, reach_i in zip(direct_network.reaches, iterative_network.reaches):
+            self.assertAlmostEqual(reach_d.discharge, reach_i.discharge, places=3)
+
+    def test_anderson_acceleration_matches_damped_newton(self):
+        """
+        Anderson-accelerated iterations should converge to the same transient
+        as the plain damped Newton iteration.
+        """
+        plain_network = build_channel_with_weir()
+        anderson_network = build_channel_with_weir()
+        plain = Solver(plain_network, max_iterations=50)
+        anderson = Solver(anderson_network, max_iterations=50, anderson_depth=3)
+
+        for _ in range(10):
+            self.assertTrue(plain.solve_step(dt=60.0))
+            self.assertTrue(anderson.solve_step(dt=60.0))
+
+        for node_p, node_a in zip(plain_network.nodes, anderson_network.nodes):
+            self.assertAlmostEqual(node_p.head, node_a.head, places=4)
+        for reach_p, reach_a in zip(plain_network.reaches, anderson_network.reaches):
+            self.assertAlmostEqual(reach_p.discharge, reach_a.discharge, places=3)
+
+    def test_reach_and_weir_edits_after_construction_take_effect(self):
+        """
+        Changing a reach's roughness or geometry or a weir's crest between
+        steps must give the same transient as building the solver with the
+        changed values.
+        """
+        edited_network = build_channel_with_weir()
+        edited = Solver(edited_network, max_iterations=50)
+        rebuilt_network = build_channel_with_weir()
+        for network in (edited_network, rebuilt_network):
+            network.get_reach("R3").manning_coefficient = 0.06
+            network.get_reach("R5").bottom_width = 6.0
+            network.get_structure("Weir").crest_elevation = 9.7
+        rebuilt = Solver(rebuilt_network, max_iterations=50)
+
+        for _ in range(10):
+            self.assertTrue(edited.solve_step(dt=60.0))
+            self.assertTrue(rebuilt.solve_step(dt=60.0))
+
+        for node_e, node_r in zip(edited_network.nodes, rebuilt_network.nodes):
+            self.assertEqual(node_e.head, node_r.head)
+
+
+if __name__ == '__main__':
+    unittest.main()
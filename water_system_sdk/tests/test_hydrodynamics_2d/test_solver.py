@@ -0,0 +1,90 @@
+import unittest
+
+import numpy as np
+
+from chs_sdk.modules.hydrodynamics_2d.mesh import UnstructuredMesh
+from chs_sdk.modules.hydrodynamics_2d.data_manager import GPUDataManager
+from chs_sdk.modules.hydrodynamics_2d.solver import Solver
+
+
+def square_basin(n, size):
+    """A closed square basin of n x n squares, each split into two triangles."""
+    xs = np.linspace(0.0, size, n + 1)
+    points = np.array([(x, y) for y in xs for x in xs])
+    cells = []
+    for j in range(n):
+        for i in range(n):
+            a = j * (n + 1) + i
+            c = a + n + 1
+            cells += [(a, a + 1, c + 1), (a, c + 1, c)]
+    return points, np.array(cells)
+
+
+def dam_break(n, size, **kwargs):
+    """A 0.5 m pool with a 1.5 m column over the left half of the basin."""
+    mesh = UnstructuredMesh(*square_basin(n, size))
+    dm = GPUDataManager(mesh, manning_n=0.03, initial_h=0.5, **kwargs)
+    dm.h[mesh.cell_centers[:, 0] < 0.5 * size] = 1.5
+    return mesh, dm
+
+
+# h, hu and hv of dam_break(4, 40.0) after 10 steps of 0.2 s, from the
+# original (per-component arrays, edge scatter) float32 solver.
+_REFERENCE_H = np.array([
+    1.6129086, 1.4080905, 2.0446701, 0.8528623, 0.50900221, 0.33582124, 0.50024658, 0.49034333,
+    1.6448464, 1.3995832, 2.2984397, 0.79799086, 0.56221426, 0.32466003, 0.50171155, 0.47780794,
+    1.6445965, 1.4046322, 2.2956185, 0.80103326, 0.557612, 0.32513401, 0.50281352, 0.47810346,
+    1.6103169, 1.4356335, 2.3307388, 0.96108222, 0.55588198, 0.35217428, 0.50270861, 0.48072162,
+])
+_REFERENCE_HU = np.array([
+    1.1123745, 0.12793775, 2.5772905, 0.32806891, -0.13047409, -0.18736769, -0.0045972583, -0.01423657,
+    1.1669278, 0.14463906, 2.5548286, 0.37085739, -0.19549948, -0.17425573, -0.011719885, -0.031672575,
+    1.168866, 0.14345381, 2.5613463, 0.3724981, -0.19275913, -0.17438926, -0.012155171, -0.030524544,
+    0.98337322, 0.11541405, 2.7682438, 0.43360797, -0.17752038, -0.18784742, -0.011145988, -0.029494468,
+])
+_REFERENCE_HV = np.array([
+    0.26821473, -0.056075912, 2.0832219, 0.0038406961, 0.1230804, 0.031242263, 0.0045937514, 0.00010671632,
+    0.074471079, -0.072975218, 0.12982686, -0.06599848, 0.033832759, -0.016480926, 0.0075146384, -0.00093778438,
+    0.063644104, -0.088063374, 0.064782038, -0.071458928, 0.019340971, -0.017202247, 0.0010920551, -0.0012688288,
+    0.025500966, -0.11541404, -0.23074974, -0.51857519, 0.0026401849, -0.054961186, 0.00021960754, -0.0043300842,
+])
+
+
+class TestShallowWaterSolver(unittest.TestCase):
+
+    def test_fixed_step_matches_reference(self):
+        # The original solver used a fixed 1e-6 m dry tolerance.
+        _, dm = dam_break(4, 40.0, dry_tolerance=1e-6)
+        solver = Solver(dm)
+        for _ in range(10):
+            solver.step(0.2)
+        np.testing.assert_allclose(dm.h, _REFERENCE_H, rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(dm.hu, _REFERENCE_HU, rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(dm.hv, _REFERENCE_HV, rtol=1e-5, atol=1e-6)
+
+    def test_closed_basin_conserves_volume(self):
+        for scheme in ('euler', 'ssp_rk2'):
+            with self.subTest(scheme=scheme):
+                mesh, dm = dam_break(20, 100.0, dtype=np.float64)
+                volume = np.dot(dm.h, mesh.cell_areas)
+                solver = Solver(dm, time_integration=scheme)
+                self.assertAlmostEqual(solver.advance(1.0), 1.0)
+                self.assertAlmostEqual(np.dot(dm.h, mesh.cell_areas) / volume, 1.0, places=12)
+                self.assertTrue(np.all(dm.h > 0.0))
+
+    def test_advance_sub_steps_respect_stable_dt(self):
+        _, dm = dam_break(10, 50.0)
+        solver = Solver(dm, cfl=0.4, time_integration='ssp_rk2')
+        stable, taken = [], []
+        stable_dt, integrate = solver.stable_dt, solver._integrate
+        solver.stable_dt = lambda: stable.append(stable_dt()) or stable[-1]
+        solver._integrate = lambda fluxes, dt: taken.append(dt) or integrate(fluxes, dt)
+
+        self.assertAlmostEqual(solver.advance(1.0), 1.0)
+        self.assertGreater(len(taken), 1)
+        self.assertTrue(all(dt <= limit for dt, limit in zip(taken, stable)))
+        self.assertAlmostEqual(sum(taken), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
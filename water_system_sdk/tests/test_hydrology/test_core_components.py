@@ -3,6 +3,7 @@ import os
 import sys
 
 from chs_sdk.modules.hydrology.core import SubBasin
+from chs_sdk.modules.modeling.hydrology.interception_models import HumanActivityModel, BatchHumanActivityModel
 
 class TestCoreComponents(unittest.TestCase):
 
@@ -58,6 +59,49 @@ class TestCoreComponents(unittest.TestCase):
         # Also check that some runoff is still produced (from the impervious area)
         self.assertGreater(runoff_enabled, 0)
 
+    def test_xinanjiang_sub_basin_follows_parameter_updates(self):
+        """Changing the runoff model's parameter dict takes effect on the next step."""
+        params = {"runoff_model": "Xinanjiang",
+                  "runoff_parameters": {"WM": 120.0, "B": 0.3, "IM": 0.05, "states": {"initial_W": 80.0}}}
+        updated = SubBasin("Updated", 100.0, params)
+        updated.calculate_runoff(12.0, 0.0, 1.0)
+        updated.runoff_model.params["evaporation"] = 2.0
+        updated.runoff_model.params["IM"] = 0.2
+
+        params["runoff_parameters"] = dict(params["runoff_parameters"], evaporation=2.0, IM=0.2)
+        fresh = SubBasin("Fresh", 100.0, params)
+        fresh.runoff_model.W = updated.runoff_model.W
+        self.assertEqual(updated.calculate_runoff(12.0, 0.0, 1.0), fresh.calculate_runoff(12.0, 0.0, 1.0))
+        self.assertEqual(updated.runoff_model.W, fresh.runoff_model.W)
+
+    def test_intercept_series_matches_stepwise_interception(self):
+        """
+        Intercepting a whole rainfall series at once must deplete the
+        interception capacity exactly like calling intercept() per step.
+        """
+        rainfall = [0.0, 2.5, 1.0, 4.0, 0.5, 3.0]
+        params = {"initial_interception_capacity_mm": 6.0}
+
+        stepwise = HumanActivityModel(params)
+        expected = [stepwise.intercept(r) for r in rainfall]
+
+        batched = HumanActivityModel(params)
+        net_rainfall = batched.intercept_series(rainfall)
+
+        self.assertEqual(list(net_rainfall), expected)
+        self.assertEqual(batched.capacity, stepwise.capacity)
+
+    def test_batch_interception_matches_per_basin_models(self):
+        params_list = [{"initial_interception_capacity_mm": c} for c in (0.0, 1.5, 6.0)]
+        models = [HumanActivityModel(params) for params in params_list]
+        batch = BatchHumanActivityModel.from_params(params_list)
+
+        for rainfall in ([0.0, 2.5, 1.0], [4.0, 0.5, 3.0], [1.0, 1.0, 1.0]):
+            net_rainfall = batch.intercept(rainfall)
+            expected = [model.intercept(r) for model, r in zip(models, rainfall)]
+            self.assertEqual(list(net_rainfall), expected)
+        self.assertEqual(list(batch.capacity), [model.capacity for model in models])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+
+from chs_sdk.modules.modeling.hydrology.routing_models import MuskingumModel, MuskingumBatchRouter
+
+
+class TestMuskingumModel(unittest.TestCase):
+
+    def test_route_series_matches_step_by_step_routing(self):
+        """
+        Routing a whole series in one call must give the same outflows and
+        final states as routing it one time step at a time.
+        """
+        params = {"K": 6.0, "x": 0.25, "area": 120.0}
+        states = {"initial_inflow": 2.0, "initial_outflow": 5.0}
+        rainfall = np.array([0.0, 4.0, 12.0, 7.5, 1.0, 0.0, 0.0, 3.0])
+        dt = 1.0
+
+        stepped = MuskingumModel(states=states)
+        expected = [stepped.route_flow(r, params, dt) for r in rainfall]
+
+        batched = MuskingumModel(states=states)
+        outflow = batched.route_series(rainfall, params, dt)
+
+        np.testing.assert_allclose(outflow, expected, rtol=1e-12)
+        self.assertAlmostEqual(batched.I_prev, stepped.I_prev)
+        self.assertAlmostEqual(batched.O_prev, stepped.O_prev)
+        self.assertAlmostEqual(batched.output, stepped.output)
+
+    def test_route_flow_vectorized_leaves_states_untouched_by_default(self):
+        params = np.zeros(3, dtype=[('area', 'f4'), ('K', 'f4'), ('x', 'f4')])
+        params['area'], params['K'], params['x'] = [50.0, 200.0, 800.0], [3.0, 12.0, 24.0], [0.1, 0.2, 0.4]
+        rainfall = np.array([2.0, 0.0, 7.5])
+        I_prev, O_prev = np.array([1.0, 2.0, 3.0]), np.array([4.0, 5.0, 6.0])
+
+        model = MuskingumModel()
+        outflow, I_new, O_new = model.route_flow_vectorized(rainfall, I_prev, O_prev, params, 1.0)
+        np.testing.assert_array_equal(I_prev, [1.0, 2.0, 3.0])
+        np.testing.assert_array_equal(O_prev, [4.0, 5.0, 6.0])
+        self.assertIsNot(outflow, O_new)
+
+        inplace = model.route_flow_vectorized(rainfall, I_prev, O_prev, params, 1.0, inplace=True)
+        np.testing.assert_array_equal(inplace[0], outflow)
+        self.assertIs(inplace[1], I_prev)
+        self.assertIs(inplace[2], O_prev)
+        np.testing.assert_array_equal(O_prev, O_new)
+
+    def test_batch_router_matches_per_basin_series(self):
+        params = {"K": np.array([3.0, 12.0, 24.0]), "x": np.array([0.1, 0.2, 0.4]),
+                  "area": np.array([50.0, 200.0, 800.0])}
+        rainfall = np.random.default_rng(0).uniform(0.0, 10.0, (3, 48))
+        dt = 2.0
+
+        initial_outflow = [1.0, 4.0, 9.0]
+
+        router = MuskingumBatchRouter(params, dt, initial_outflow=initial_outflow)
+        outflow = router.route(rainfall)
+
+        for i in range(3):
+            model = MuskingumModel(states={"initial_outflow": initial_outflow[i]})
+            basin = {k: v[i] for k, v in params.items()}
+            np.testing.assert_allclose(outflow[i], model.route_series(rainfall[i], basin, dt), rtol=1e-12)
+            self.assertAlmostEqual(router.O_prev[i], model.O_prev)
+            self.assertAlmostEqual(router.I_prev[i], model.I_prev)
+
+        stepped = MuskingumBatchRouter(params, dt, initial_outflow=initial_outflow)
+        for t in range(rainfall.shape[1]):
+            np.testing.assert_allclose(stepped.step(rainfall[:, t]), outflow[:, t], rtol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
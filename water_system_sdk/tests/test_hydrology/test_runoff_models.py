@@ -0,0 +1,28 @@
+import unittest
+
+import numpy as np
+
+from chs_sdk.modules.modeling.hydrology.runoff_models import XinanjiangModel
+
+
+class TestXinanjiangModel(unittest.TestCase):
+
+    def test_calculate_runoff_vectorized_leaves_state_untouched_by_default(self):
+        params = np.zeros(3, dtype=[('WM', 'f4'), ('B', 'f4'), ('IM', 'f4')])
+        params['WM'], params['B'], params['IM'] = [80.0, 120.0, 100.0], [0.2, 0.3, 0.4], 0.05
+        rainfall = np.array([12.0, 0.0, 30.0], dtype=np.float32)
+        W_initial = np.array([40.0, 60.0, 90.0], dtype=np.float32)
+
+        model = XinanjiangModel()
+        runoff, W_new = model.calculate_runoff_vectorized(rainfall, W_initial, params, 1.0)
+        np.testing.assert_array_equal(W_initial, [40.0, 60.0, 90.0])
+        self.assertIsNot(W_new, W_initial)
+
+        inplace = model.calculate_runoff_vectorized(rainfall, W_initial, params, 1.0, inplace=True)
+        np.testing.assert_array_equal(inplace[0], runoff)
+        self.assertIs(inplace[1], W_initial)
+        np.testing.assert_array_equal(W_initial, W_new)
+
+
+if __name__ == '__main__':
+    unittest.main()
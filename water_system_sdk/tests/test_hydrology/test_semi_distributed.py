@@ -0,0 +1,104 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+from chs_sdk.modules.modeling.hydrology.semi_distributed import SemiDistributedHydrologyModel
+from chs_sdk.modules.modeling.hydrology.runoff_models import XinanjiangModel
+from chs_sdk.modules.modeling.hydrology.routing_models import MuskingumModel
+from chs_sdk.modules.modeling.hydrology.batch import HydrologyBatch
+
+
+def _sub_basins(rng, n):
+    return [
+        {"id": f"SB{i}", "area": rng.uniform(10.0, 500.0), "coords": (0.0, 0.0),
+         "params": {"WM": rng.uniform(60.0, 140.0), "B": rng.uniform(0.1, 0.5),
+                    "K": rng.uniform(2.0, 20.0), "x": rng.uniform(0.0, 0.4),
+                    "initial_outflow": 1.0}}
+        for i in range(n)
+    ]
+
+
+class TestSemiDistributedHydrologyModel(unittest.TestCase):
+
+    def test_fused_step_matches_strategy_calls(self):
+        """
+        The fused Xinanjiang + Muskingum kernel must give the same outflows
+        and states as calling the two vectorized strategies one after another.
+        """
+        rng = np.random.default_rng(0)
+        sub_basins = _sub_basins(rng, 8)
+        precipitation = rng.uniform(0.0, 20.0, 48) * (rng.random(48) > 0.4)
+
+        models = []
+        for fused in (True, False):
+            model = SemiDistributedHydrologyModel(sub_basins, XinanjiangModel(), MuskingumModel(),
+                                                  fused=fused, name="basin")
+            models.append((model, [model.step(dt=1.0, t=k, precipitation=p) for k, p in enumerate(precipitation)]))
+
+        (fused, fused_out), (stepped, stepped_out) = models
+        np.testing.assert_allclose(fused_out, stepped_out, rtol=1e-12)
+        np.testing.assert_array_equal(fused.runoff_state_W, stepped.runoff_state_W)
+        np.testing.assert_allclose(fused.routing_state_O_prev, stepped.routing_state_O_prev, rtol=1e-12)
+
+    def test_strategy_without_runoff_out_parameter(self):
+        """A vectorized runoff strategy with the plain signature is not passed `runoff_out`."""
+        class PlainRunoff(XinanjiangModel):
+            def calculate_runoff_vectorized(self, rainfall_vector, W_initial, params, dt):
+                return super().calculate_runoff_vectorized(rainfall_vector, W_initial, params, dt)
+
+        rng = np.random.default_rng(3)
+        sub_basins = _sub_basins(rng, 4)
+        plain = SemiDistributedHydrologyModel(sub_basins, PlainRunoff(), MuskingumModel(), name="plain")
+        reference = SemiDistributedHydrologyModel(sub_basins, XinanjiangModel(), MuskingumModel(),
+                                                  fused=False, name="reference")
+        for k, p in enumerate(rng.uniform(0.0, 20.0, 6)):
+            self.assertEqual(plain.step(dt=1.0, t=k, precipitation=p),
+                             reference.step(dt=1.0, t=k, precipitation=p))
+
+    def test_batch_matches_stepping_each_model(self):
+        rng = np.random.default_rng(1)
+        basins = [_sub_basins(rng, n) for n in (3, 12, 5)]
+        precipitation = rng.uniform(0.0, 20.0, (24, len(basins)))
+
+        def make_models():
+            return [SemiDistributedHydrologyModel(b, XinanjiangModel(), MuskingumModel(), name=f"basin{i}")
+                    for i, b in enumerate(basins)]
+
+        models = make_models()
+        expected = [[m.step(dt=1.0, t=k, precipitation=p[j]) for j, m in enumerate(models)]
+                    for k, p in enumerate(precipitation)]
+
+        with HydrologyBatch(make_models(), max_workers=2, min_task_basins=1) as batch:
+            outflows = batch.run(precipitation, dt=1.0)
+        np.testing.assert_allclose(outflows, expected, rtol=1e-12)
+
+    def test_batch_steps_sequentially_under_workqueue_layer(self):
+        """
+        Numba's 'workqueue' threading layer aborts when parallel kernels are
+        launched from several threads, so the batch must not use its pool.
+        """
+        script = (
+            "import numpy as np\n"
+            "from test_semi_distributed import _sub_basins\n"
+            "from chs_sdk.modules.modeling.hydrology.batch import HydrologyBatch\n"
+            "from chs_sdk.modules.modeling.hydrology.semi_distributed import SemiDistributedHydrologyModel\n"
+            "from chs_sdk.modules.modeling.hydrology.runoff_models import XinanjiangModel\n"
+            "from chs_sdk.modules.modeling.hydrology.routing_models import MuskingumModel\n"
+            "rng = np.random.default_rng(2)\n"
+            "models = [SemiDistributedHydrologyModel(_sub_basins(rng, n), XinanjiangModel(), MuskingumModel(), name=str(n))\n"
+            "          for n in (3, 12, 5)]\n"
+            "with HydrologyBatch(models, max_workers=2, min_task_basins=1) as batch:\n"
+            "    assert batch._executor is None\n"
+            "    batch.run(rng.uniform(0.0, 20.0, (12, 3)), dt=1.0)\n"
+        )
+        env = dict(os.environ, NUMBA_THREADING_LAYER="workqueue",
+                   PYTHONPATH=os.pathsep.join([os.path.dirname(__file__)] + sys.path))
+        result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+import numpy as np
+
+from chs_sdk.modules.modeling.channel_models import ChannelModel
+
+
+CHANNEL = dict(length=2000.0, num_cells=25, cross_section={'shape_type': 'trapezoid', 'bottom_width': 8.0,
+                                                            'side_slope': 1.5},
+               manning_n=0.03, bed_slope=0.0005, dispersion_coeff=5.0)
+
+
+def reference_step(depths, concentrations, dt, upstream_flow, upstream_concentration,
+                   length, num_cells, cross_section, manning_n, bed_slope, dispersion_coeff):
+    """One step of the original per-cell loops of ChannelModel, in plain Python."""
+    bw, z = cross_section['bottom_width'], cross_section['side_slope']
+    dx = length / num_cells
+
+    def area(y):
+        y = max(0.0, y)
+        return (bw + z * y) * y
+
+    def flow(y):
+        if y <= 0:
+            return 0.0
+        a = area(y)
+        rh = a / (bw + 2 * max(0.0, y) * np.sqrt(1 + z ** 2)) if a > 1e-6 else 0.0
+        return (1.0 / manning_n) * a * rh ** (2 / 3) * np.sqrt(bed_slope)
+
+    flows = [flow(y) for y in depths]
+    new_depths = list(depths)
+    for i in range(num_cells):
+        q_in = flows[i - 1] if i > 0 else upstream_flow
+        top_width = bw + 2 * z * max(0.0, depths[i])
+        if top_width > 1e-6:
+            new_depths[i] += (q_in - flows[i]) * (dt / dx) / top_width
+    depths = [max(0.0, y) for y in new_depths]
+
+    new_concentrations = list(concentrations)
+    for i in range(num_cells):
+        a = area(depths[i])
+        v = flows[i] / a if a > 1e-6 else 0.0
+        c_prev = concentrations[i - 1] if i > 0 else upstream_concentration
+        c_next = concentrations[i + 1] if i < num_cells - 1 else concentrations[i]
+        advection = -v * (concentrations[i] - c_prev) / dx
+        dispersion = dispersion_coeff * (c_prev - 2 * concentrations[i] + c_next) / dx ** 2
+        new_concentrations[i] += (advection + dispersion) * dt
+    concentrations = [max(0.0, c) for c in new_concentrations]
+    return depths, [flow(y) for y in depths], concentrations
+
+
+class TestChannelModel(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.dt = 10.0
+        self.upstream = np.column_stack([rng.uniform(0.0, 40.0, 300), rng.uniform(0.0, 2.0, 300)])
+
+    def test_step_matches_reference_loop(self):
+        """The fused kernel must reproduce the original loops, from a dry start."""
+        model = ChannelModel(initial_depth=0.0, **CHANNEL)
+        depths, concentrations = [0.0] * CHANNEL['num_cells'], [0.0] * CHANNEL['num_cells']
+        for q, c in self.upstream:
+            outlet = model.step(self.dt, q, c)
+            depths, flows, concentrations = reference_step(depths, concentrations, self.dt, q, c, **CHANNEL)
+            self.assertAlmostEqual(outlet, flows[-1], delta=1e-12 * max(1.0, abs(flows[-1])))
+        np.testing.assert_allclose(model.depths, depths, rtol=1e-12, atol=1e-14)
+        np.testing.assert_allclose(model.flows, flows, rtol=1e-12, atol=1e-14)
+        np.testing.assert_allclose(model.concentrations, concentrations, rtol=1e-12, atol=1e-14)
+
+    def test_array_step_matches_kernel(self):
+        """`_step_arrays`, the path of the 'cupy' backend, run here on NumPy arrays."""
+        kernel = ChannelModel(initial_depth=0.5, initial_concentration=1.0, **CHANNEL)
+        arrays = ChannelModel(initial_depth=0.5, initial_concentration=1.0, **CHANNEL)
+        for q, c in self.upstream:
+            kernel.step(self.dt, q, c)
+            arrays._step_arrays(self.dt, q, c)
+        np.testing.assert_allclose(arrays.depths, kernel.depths, rtol=1e-12, atol=1e-14)
+        np.testing.assert_allclose(arrays.flows, kernel.flows, rtol=1e-12, atol=1e-14)
+        np.testing.assert_allclose(arrays.concentrations, kernel.concentrations, rtol=1e-12, atol=1e-14)
+
+    def test_float32_state_stays_close_to_float64(self):
+        double = ChannelModel(initial_depth=0.5, initial_concentration=1.0, **CHANNEL)
+        single = ChannelModel(initial_depth=0.5, initial_concentration=1.0, dtype=np.float32, **CHANNEL)
+        for q, c in self.upstream:
+            double.step(self.dt, q, c)
+            single.step(self.dt, q, c)
+        self.assertEqual(single.depths.dtype, np.float32)
+        np.testing.assert_allclose(single.depths, double.depths, rtol=1e-6)
+        np.testing.assert_allclose(single.flows, double.flows, rtol=1e-6)
+        np.testing.assert_allclose(single.concentrations, double.concentrations, rtol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import collections
+import unittest
+
+import numpy as np
+
+from chs_sdk.modules.modeling.delay_models import IntegralDelayModel, BatchIntegralDelay
+
+
+class TestIntegralDelayModel(unittest.TestCase):
+
+    def test_ring_buffer_matches_fifo_queue(self):
+        """
+        The ring buffer must delay the input like a FIFO queue of delay_steps
+        values, and pass the input straight through when there is no delay.
+        """
+        inflows = np.random.default_rng(0).uniform(0.0, 10.0, 20)
+        for delay in (0.0, 1.0, 3.0):
+            with self.subTest(delay=delay):
+                model = IntegralDelayModel(delay=delay, dt=1.0, initial_value=2.5)
+                queue = collections.deque([2.5] * model.delay_steps)
+                for inflow in inflows:
+                    model.input.inflow = inflow
+                    model.step()
+                    queue.append(inflow)
+                    self.assertEqual(model.output, queue.popleft())
+                self.assertEqual(model.get_state()["buffer"], list(queue))
+
+    def test_batch_delay_matches_per_channel_models(self):
+        inflows = np.random.default_rng(1).uniform(0.0, 10.0, (15, 4))
+        initial_value = np.array([0.0, 1.0, 2.0, 3.0])
+        for delay in (0.0, 4.0):
+            with self.subTest(delay=delay):
+                batch = BatchIntegralDelay(4, delay=delay, dt=1.0, initial_value=initial_value)
+                models = [IntegralDelayModel(delay=delay, dt=1.0, initial_value=v) for v in initial_value]
+                for inflow in inflows:
+                    output = batch.step(inflow)
+                    for model, u in zip(models, inflow):
+                        model.input.inflow = u
+                        model.step()
+                    np.testing.assert_array_equal(output, [model.output for model in models])
+                self.assertEqual(batch.get_state()["buffer"], [model.get_state()["buffer"] for model in models])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+
+import numpy as np
+
+from chs_sdk.modules.modeling.first_order_system import FirstOrderSystem, BatchFirstOrderSystem
+
+
+class TestBatchFirstOrderSystem(unittest.TestCase):
+
+    def test_batch_matches_per_channel_systems(self):
+        rng = np.random.default_rng(0)
+        a1 = rng.uniform(0.5, 0.95, 5)
+        b1 = rng.uniform(0.1, 1.0, 5)
+        initial_output = rng.uniform(0.0, 3.0, 5)
+        inflows = rng.uniform(0.0, 10.0, (30, 5))
+
+        batch = BatchFirstOrderSystem(a1, b1, initial_output=initial_output)
+        systems = [FirstOrderSystem(a, b, initial_output=y0) for a, b, y0 in zip(a1, b1, initial_output)]
+        for inflow in inflows:
+            output = batch.step(inflow)
+            np.testing.assert_array_equal(output, [system.step(u) for system, u in zip(systems, inflow)])
+
+
+if __name__ == '__main__':
+    unittest.main()